@@ -0,0 +1,31 @@
+"""
+Leaner lxml parser settings for python-pptx.
+
+Importing this module replaces python-pptx's shared `pptx.oxml.oxml_parser`
+(which `parse_xml` looks up on every call) with one that also skips xml:id
+collection. The custom element class lookup, blank-text removal and entity
+handling are kept as is.
+
+`huge_tree=True` is deliberately not set, even though it was part of the
+original spec for this parser: it lifts libxml2's nesting-depth and
+text-node size limits, and input decks are untrusted files. The limits only
+reject pathological XML that no real slide part comes near.
+Import it before the first `Presentation()` call.
+
+The parser itself has to stay lxml: python-pptx maps every tag to its own
+`CT_*` element classes through the lookup, and the merge clones and
+re-parents those elements. Trees from faster non-lxml parsers (pygixml,
+for instance) would have to be re-serialized and parsed again by lxml,
+which costs more than parsing with lxml once.
+"""
+from lxml import etree
+
+import pptx.oxml
+
+oxml_parser = etree.XMLParser(
+    remove_blank_text=True,
+    resolve_entities=False,
+    collect_ids=False,
+)
+oxml_parser.set_element_class_lookup(pptx.oxml.element_class_lookup)
+pptx.oxml.oxml_parser = oxml_parser
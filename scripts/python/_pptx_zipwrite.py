@@ -0,0 +1,154 @@
+"""
+Faster zip writing when python-pptx saves a deck.
+
+python-pptx writes every part with ZIP_DEFLATED, one after another. Importing
+this module patches its zip package writer so that:
+
+- JPEG, PNG, GIF and the audio/video formats, which are entropy-coded
+  already, are written with ZIP_STORED instead of being deflated again;
+- the remaining parts are deflated on a thread pool (zlib releases the GIL
+  while compressing) as python-pptx hands them over, and written in their
+  original order; at most IN_FLIGHT parts are held waiting at a time, so
+  the package is never buffered whole.
+
+The deflate settings are the ones zipfile itself uses, so the member data
+is the same as before. Handing zipfile pre-deflated data relies on a private
+detail of CPython's `zipfile._ZipWriteFile` (its `_compressor`), so it is only
+used on the CPython versions it was checked against and after a round-trip
+self-test at import; otherwise members are written with the public, serial
+`ZipFile.writestr()`.
+
+`_ZipPkgWriter` is private python-pptx API too. Its write()/__exit__
+contract was checked against python-pptx 1.0.x only (requirements.txt still
+allows older releases, which keep the writer elsewhere), so on any other
+version the module leaves python-pptx's writer untouched and PATCHED is False.
+"""
+import io
+import os
+import posixpath
+import sys
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pptx
+
+# Extensions of media parts whose payload is already compressed
+STORED_EXTS = frozenset({
+    '.jpeg', '.jpg', '.png', '.gif',
+    '.mp4', '.m4v', '.mov', '.m4a', '.mp3', '.wma', '.wmv',
+})
+# Deflate threads, and parts submitted but not yet written to the archive
+WORKERS = os.cpu_count() or 1
+IN_FLIGHT = 2 * WORKERS
+
+
+def _is_stored(membername):
+    return posixpath.splitext(membername)[1].lower() in STORED_EXTS
+
+
+def _deflate(blob):
+    # Raw deflate stream, as zipfile's own ZIP_DEFLATED compressor produces
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return compressor.compress(blob) + compressor.flush()
+
+
+class _Precompressed:
+    """Compressor stand-in that hands zipfile data deflated ahead of time."""
+
+    def __init__(self, data):
+        self._data = data
+
+    def compress(self, _):
+        data, self._data = self._data, b''
+        return data
+
+    def flush(self):
+        return b''
+
+
+def _write_deflated(zf, membername, blob, deflated):
+    # Same entry metadata as ZipFile.writestr(); only the compression step is
+    # swapped, so CRC, sizes and headers are still filled in by zipfile
+    zinfo = zipfile.ZipInfo(membername, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.external_attr = 0o600 << 16
+    zinfo.file_size = len(blob)
+    with zf.open(zinfo, mode='w') as dest:
+        dest._compressor = _Precompressed(deflated)
+        dest.write(blob)
+
+
+def _precompress_supported():
+    """True if `_write_deflated` produces a valid member on this interpreter."""
+    if sys.implementation.name != 'cpython' or not (3, 8) <= sys.version_info[:2] <= (3, 13):
+        return False
+    blob = b'<p:sld>precompress self-test</p:sld>' * 64
+    buf = io.BytesIO()
+    try:
+        with zipfile.ZipFile(buf, 'w') as zf:
+            _write_deflated(zf, 'check.xml', blob, _deflate(blob))
+        with zipfile.ZipFile(buf) as zf:
+            info = zf.getinfo('check.xml')
+            return (zf.testzip() is None and zf.read('check.xml') == blob
+                    and info.compress_type == zipfile.ZIP_DEFLATED
+                    and info.compress_size == len(_deflate(blob)))
+    except Exception:
+        return False
+
+
+PRECOMPRESS = _precompress_supported()
+
+
+def _write_next(self):
+    membername, blob, future = self._window.popleft()
+    if future is None:
+        self._zipf.writestr(membername, blob, compress_type=zipfile.ZIP_STORED)
+    else:
+        _write_deflated(self._zipf, membername, blob, future.result())
+
+
+def _write(self, pack_uri, blob):
+    membername = pack_uri.membername
+    if not PRECOMPRESS:
+        compress_type = zipfile.ZIP_STORED if _is_stored(membername) else None
+        self._zipf.writestr(membername, blob, compress_type=compress_type)
+        return
+    if '_window' not in self.__dict__:
+        self._window = deque()
+        self._executor = ThreadPoolExecutor(max_workers=WORKERS)
+    future = None if _is_stored(membername) else self._executor.submit(_deflate, blob)
+    self._window.append((membername, blob, future))
+    # Write finished parts as soon as everything before them is out, and
+    # block on the oldest once the window is full
+    window = self._window
+    while window and (len(window) > IN_FLIGHT or window[0][2] is None or window[0][2].done()):
+        _write_next(self)
+
+
+def _exit(self, exc_type, exc_value, traceback):
+    window = self.__dict__.get('_window', ())
+    executor = self.__dict__.get('_executor')
+    try:
+        if exc_type is None:
+            while window:
+                _write_next(self)
+        else:
+            # Saving failed part-way; drop the parts not yet written
+            for _, _, future in window:
+                if future is not None:
+                    future.cancel()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        self._zipf.close()
+
+
+PATCHED = pptx.__version__.startswith('1.0.')
+if PATCHED:
+    from pptx.opc.serialized import _ZipPkgWriter
+
+    _ZipPkgWriter.write = _write
+    _ZipPkgWriter.__exit__ = _exit
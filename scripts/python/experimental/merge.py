@@ -1,5 +1,68 @@
+import io
+import re
 import sys
+from copy import deepcopy
+
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# Relationships the new slide already has (or must not share) after add_slide()
+_SKIP_RELTYPES = {RT.SLIDE_LAYOUT, RT.NOTES_SLIDE}
+# Attributes in the r: namespace that hold a relationship id
+_R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def _find_layout(presentation, name):
+    """Layout with the given name, falling back to the first layout."""
+    for layout in presentation.slide_layouts:
+        if layout.name == name:
+            return layout
+    return presentation.slide_layouts[0]
+
+
+def _relate(dest_part, rel):
+    """Recreate `rel` from a source slide part on `dest_part`; return the new rId."""
+    if rel.is_external:
+        return dest_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+    if rel.reltype == RT.IMAGE:
+        # Re-adds the image under a fresh partname, shared with identical images
+        _, rId = dest_part.get_or_add_image_part(io.BytesIO(rel.target_part.blob))
+        return rId
+    # Other parts (charts, media, ...) move across; give them a partname that is
+    # free in the destination so they don't clash with its own parts
+    target = rel.target_part
+    tmpl = re.sub(r'\d*(\.\w+)$', r'%d\1', target.partname)
+    target.partname = dest_part.package.next_partname(tmpl)
+    return dest_part.relate_to(target, rel.reltype)
+
+
+def clone_slide(merged_presentation, slide):
+    """Append a copy of `slide` (from another deck) with its shapes and relationships."""
+    layout = _find_layout(merged_presentation, slide.slide_layout.name)
+    new_slide = merged_presentation.slides.add_slide(layout)
+
+    # Relationship ids differ in the new slide part, so map old -> new
+    rId_map = {}
+    for rId, rel in slide.part.rels.items():
+        if rel.reltype not in _SKIP_RELTYPES:
+            rId_map[rId] = _relate(new_slide.part, rel)
+
+    # Swap the layout's placeholder shapes for a copy of the source shape tree
+    src_cSld = slide.element.cSld
+    dest_cSld = new_slide.element.cSld
+    new_spTree = deepcopy(src_cSld.spTree)
+    dest_cSld.replace(dest_cSld.spTree, new_spTree)
+    if src_cSld.bg is not None:
+        if dest_cSld.bg is not None:
+            dest_cSld.remove(dest_cSld.bg)
+        dest_cSld.insert(0, deepcopy(src_cSld.bg))
+
+    for elem in new_slide.element.iter():
+        for attr, value in elem.attrib.items():
+            if attr.startswith(_R_NS) and value in rId_map:
+                elem.set(attr, rId_map[value])
+    return new_slide
+
 
 def merge_presentations(output_file, input_files):
     merged_presentation = Presentation(input_files[0]) # Start with the first file
@@ -7,16 +70,13 @@ def merge_presentations(output_file, input_files):
     for file in input_files[1:]:
         source_presentation = Presentation(file)
         for slide in source_presentation.slides:
-            # Note: This basic method copies content but 
-            # requires manual handling for complex layouts/masters
-            slide_layout = merged_presentation.slide_layouts[0] 
-            merged_presentation.slides.add_slide(slide_layout)
-            # Add logic here to copy shapes if deep-cloning is needed
-            
+            # Shapes are copied as XML; layouts/masters still come from the first deck
+            clone_slide(merged_presentation, slide)
+
     merged_presentation.save(output_file)
     print(f"Successfully merged into {output_file}")
 
 if __name__ == "__main__":
     output = sys.argv[1]
     inputs = sys.argv[2:]
-    merge_presentations(output, inputs)
\ No newline at end of file
+    merge_presentations(output, inputs)
@@ -32,6 +32,11 @@ def prompt(msg):
 def run_script(script, args):
     cmd = [sys.executable, script] + args
     print("Running:", shlex.join(cmd))
+    if os.name == "posix":
+        # Running the script is the last thing this CLI does, so hand the
+        # process over to it instead of forking a child and waiting
+        sys.stdout.flush()
+        os.execvp(sys.executable, cmd)
     subprocess.run(cmd)
 
 
@@ -3,24 +3,45 @@
 those images into a new PPTX. This guarantees visual fidelity but makes
 slides non-editable.
 
-Requires `soffice` (LibreOffice) installed for conversion. The script
-will detect `soffice` or `libreoffice` on PATH and use it for slide-to-PNG
-conversion.
+Requires `soffice` (LibreOffice) and `pdftoppm` (poppler-utils) installed
+for conversion. Each deck is exported to PDF with LibreOffice (detected as
+`soffice` or `libreoffice` on PATH) and pdftoppm renders one PNG per page,
+so every slide is kept rather than only the first.
 
 Usage:
   python3 scripts/python/merge_images.py [output.pptx] input1.pptx input2.pptx ...
   Output filename is optional - auto-generates if omitted.
 """
 import argparse
+import io
 import os
 import random
+import re
 import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
+from pathlib import Path
+
+from PIL import Image
+
+# _pptx_fastparse lives one level up, next to merge_pptx.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _pptx_fastparse  # swaps in the leaner XML parser before any deck is loaded
+import _pptx_zipwrite  # stores JPEG/PNG/video parts instead of re-deflating them
 from pptx import Presentation
 
+# Opened once and shared by every soffice/pdftoppm call, rather than
+# subprocess opening os.devnull twice per call
+_DEVNULL = open(os.devnull, "wb")
+
+# Rendered slides are downscaled to at most this resolution for the slide size
+IMAGE_DPI = 150
+EMU_PER_INCH = 914400
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 OUTPUT_DIR = os.path.join(ROOT, "assets", "output", "merge_images")
 
@@ -56,20 +77,54 @@ def find_soffice():
     return None
 
 
-def convert_to_png(soffice_cmd, src, outdir):
-    # Use LibreOffice headless convert-to png
-    cmd = [soffice_cmd, "--headless", "--convert-to", "png", "--outdir", outdir, src]
-    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+def convert_to_pngs(soffice_cmd, src, outdir, profile_dir=None, dpi=IMAGE_DPI):
+    """Render every slide of `src` to `outdir`; return the PNG paths in slide order."""
+    # `--convert-to png` only renders the first slide, so go through PDF
+    cmd = [soffice_cmd, "--headless", "--convert-to", "pdf", "--outdir", outdir, src]
+    if profile_dir:
+        # A private profile per process, so parallel instances don't lock each other out
+        cmd.insert(1, f"-env:UserInstallation={Path(profile_dir).as_uri()}")
+    subprocess.run(cmd, check=True, stdout=_DEVNULL, stderr=_DEVNULL)
+
+    base = os.path.splitext(os.path.basename(src))[0]
+    pdf_path = os.path.join(outdir, base + ".pdf")
+    cmd = ["pdftoppm", "-png", "-r", str(dpi), pdf_path, os.path.join(outdir, base)]
+    subprocess.run(cmd, check=True, stdout=_DEVNULL, stderr=_DEVNULL)
+
+    # pdftoppm writes {base}-1.png, {base}-2.png ... (zero-padded for long decks);
+    # sort on the page number, since "-10" sorts before "-2" as text
+    page_re = re.compile(re.escape(base) + r"-(\d+)\.png$")
+    # Each input has its own outdir, so this only scans this deck's files
+    with os.scandir(outdir) as entries:
+        pages = [(int(m.group(1)), e.path) for e in entries for m in [page_re.match(e.name)] if m]
+    return [path for _, path in sorted(pages)]
+
+
+def _optimize(src_png, max_width, max_height):
+    """Downscale a rendered slide to fit (max_width, max_height) pixels; return JPEG bytes."""
+    with Image.open(src_png) as img:
+        img = img.convert("RGB")
+        img.thumbnail((max_width, max_height))
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=85, optimize=True)
+    return buf.getvalue()
 
 
 def build_presentation_from_images(image_paths, output_path):
     prs = Presentation()
     # try to use a blank layout if available
     blank_layout = prs.slide_layouts[6] if len(prs.slide_layouts) > 6 else prs.slide_layouts[0]
-    for img in image_paths:
+
+    # Decode/resize/re-encode the images on all cores; adding them to the deck stays serial
+    max_width = round(prs.slide_width / EMU_PER_INCH * IMAGE_DPI)
+    max_height = round(prs.slide_height / EMU_PER_INCH * IMAGE_DPI)
+    with ProcessPoolExecutor() as executor:
+        images = list(executor.map(_optimize, image_paths, repeat(max_width), repeat(max_height)))
+
+    for data in images:
         slide = prs.slides.add_slide(blank_layout)
         # Fit the image to the slide size
-        slide.shapes.add_picture(img, 0, 0, width=prs.slide_width, height=prs.slide_height)
+        slide.shapes.add_picture(io.BytesIO(data), 0, 0, width=prs.slide_width, height=prs.slide_height)
     prs.save(output_path)
 
 
@@ -83,6 +138,9 @@ def main():
     if not soffice:
         print("Error: LibreOffice (`soffice` or `libreoffice`) not found on PATH. Install LibreOffice to use this option.")
         sys.exit(1)
+    if not shutil.which("pdftoppm"):
+        print("Error: `pdftoppm` not found on PATH. Install poppler-utils to use this option.")
+        sys.exit(1)
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
@@ -94,17 +152,30 @@ def main():
 
     image_list = []
     with tempfile.TemporaryDirectory() as tmp:
+        inputs = []
         for src in args.inputs:
             if not os.path.isfile(src):
                 print(f"Warning: input not found: {src}")
                 continue
-            convert_to_png(soffice, src, tmp)
-            # LibreOffice emits files named after the source base; collect them
-            base = os.path.splitext(os.path.basename(src))[0]
-            # gather files that start with base and end with .png, sort to keep slide order
-            matches = [os.path.join(tmp, f) for f in os.listdir(tmp) if f.startswith(base) and f.lower().endswith('.png')]
-            matches.sort()
-            image_list.extend(matches)
+            inputs.append(src)
+
+        # Each conversion is its own soffice process; run them side by side,
+        # every one with its own output folder and LibreOffice profile
+        pages = {}
+        if inputs:
+            with ThreadPoolExecutor(max_workers=min(8, len(inputs))) as executor:
+                futures = {}
+                for i, src in enumerate(inputs):
+                    sub = os.path.join(tmp, f"in{i}")
+                    os.makedirs(sub)
+                    profile = os.path.join(tmp, f"lo_profile_{i}")
+                    futures[executor.submit(convert_to_pngs, soffice, src, sub, profile, IMAGE_DPI)] = i
+                for future in as_completed(futures):
+                    pages[futures[future]] = future.result()
+
+        # Collect in input order, not completion order
+        for i in range(len(inputs)):
+            image_list.extend(pages[i])
 
         if not image_list:
             print("No images produced; aborting.")
@@ -5,6 +5,9 @@ Usage: python3 src/inspect_pptx.py path/to/file.pptx
 """
 import sys
 import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _pptx_fastparse  # swaps in the leaner XML parser before any deck is loaded
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
@@ -48,7 +51,9 @@ def inspect(path):
     except Exception:
         pass
 
-    # Inspect each slide and shapes
+    # Inspect each slide and shapes; pictures sharing a media part are only
+    # read once, keyed by the image part's name
+    seen = {}
     for i, slide in enumerate(prs.slides, start=1):
         print(f"\n  Slide {i}: shapes={len(slide.shapes)}")
         for j, shape in enumerate(slide.shapes, start=1):
@@ -58,9 +63,12 @@ def inspect(path):
                 if stype == MSO_SHAPE_TYPE.PICTURE:
                     # picture
                     try:
-                        img = shape.image
-                        blob_size = len(img.blob)
-                        info += f", picture (size={blob_size} bytes, ext={img.ext})"
+                        key = shape.part.related_part(shape._element.blip_rId).partname
+                        if key not in seen:
+                            img = shape.image
+                            seen[key] = (len(img.blob), img.ext)
+                        blob_size, ext = seen[key]
+                        info += f", picture (size={blob_size} bytes, ext={ext})"
                     except Exception as e:
                         info += f", picture (could not read blob: {e!r})"
                 elif hasattr(shape, "has_text_frame") and shape.has_text_frame:
@@ -11,19 +11,41 @@ If --config is provided, reads merge configuration from JSON file.
 The resulting file will be written to `assets/output/`.
 """
 import argparse
-import io
+import gc
+import hashlib
 import os
 import sys
 import json
+import mmap
 import random
-from copy import deepcopy
+import stat
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-from pptx import Presentation
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from pptx.util import Inches
+from lxml import etree
 
-# Import theme resolver for explicit formatting
-sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _pptx_fastparse  # swaps in the leaner XML parser before any deck is loaded
+import _pptx_zipwrite  # stores JPEG/PNG/video parts instead of re-deflating them
+from pptx import Presentation
+from pptx.dml.fill import FillFormat
+from pptx.exc import PackageNotFoundError
+from pptx.oxml import parse_xml
+from pptx.parts.image import Image, ImagePart
+from pptx.shapes.picture import Picture
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+# lxml's C-level subtree copy (what deepcopy ends up calling for an element),
+# bound once so the hot shape loop skips the copy-module dispatch
+_clone = etree.ElementBase.__copy__
+
+R_EMBED = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed'
+R_LINK = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}link'
+BLIP_TAG = '{http://schemas.openxmlformats.org/drawingml/2006/main}blip'
+# Only <p:sp> shapes have a text frame (python-pptx's has_text_frame)
+SP_TAG = '{http://schemas.openxmlformats.org/presentationml/2006/main}sp'
+
+# Import theme resolver for explicit formatting (script dir is already on sys.path)
 from theme_resolver import apply_explicit_formatting
 
 
@@ -33,6 +55,10 @@ ASSETS_SLIDES = os.path.join(ROOT, "assets", "slides")
 TEMPLATES_DIR = os.path.join(ASSETS_SLIDES, "templates")
 CONFIG_DIR = os.path.join(ROOT, "assets", "config")
 OUTPUT_DIR = os.path.join(ROOT, "assets", "output", "merge_pptx")
+# Input decks parsed ahead at a time; bounds how many are held in memory
+LOAD_BATCH = 8
+# Run a full collection after this many source decks have been released
+GC_EVERY = 4
 
 
 def ensure_dir(path):
@@ -58,47 +84,60 @@ def generate_output_filename(prefix="merged-pptx", extension=".pptx"):
 def find_template():
     if not os.path.isdir(TEMPLATES_DIR):
         return None
-    for name in os.listdir(TEMPLATES_DIR):
-        if name.lower().endswith(".pptx"):
-            return os.path.join(TEMPLATES_DIR, name)
-    return None
-
+    with os.scandir(TEMPLATES_DIR) as it:
+        return next((e.path for e in it if e.name.lower().endswith(".pptx") and e.is_file()), None)
 
-def copy_text(shape, target_slide):
-    # Keep as a fallback. Prefer deep-copying the shape XML to preserve
-    # formatting when possible (see append_slide_from_source).
-    try:
-        left, top, width, height = shape.left, shape.top, shape.width, shape.height
-        textbox = target_slide.shapes.add_textbox(left, top, width, height)
-        tf = textbox.text_frame
-        # Simple copy: join paragraphs with line breaks
-        parts = []
-        for p in shape.text_frame.paragraphs:
-            runs_text = "".join([r.text for r in p.runs])
-            parts.append(runs_text)
-        tf.text = "\n".join(parts)
-    except Exception:
-        pass
 
+def new_media_cache(presentation):
+    """Media cache for merging into `presentation`, seeded with the images it already has.
+    
+    Seeding once means images shared with the base deck's layouts and masters
+    are still reused, without scanning every image part for each new picture.
+    """
+    return {
+        hashlib.sha256(part.blob).digest(): part
+        for part in presentation.part.package.iter_parts()
+        if isinstance(part, ImagePart)
+    }
 
-def copy_picture(shape, target_slide):
-    try:
-        image = shape.image
-        blob = image.blob
-        left, top, width, height = shape.left, shape.top, shape.width, shape.height
-        target_slide.shapes.add_picture(io.BytesIO(blob), left, top, width, height)
-    except Exception:
-        pass
 
+def relate_image(target_part, blob, media_cache):
+    """Return `(image_part, rId)` relating `target_part` to an image with this content.
 
-def copy_shape(shape, target_slide):
-    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-        copy_picture(shape, target_slide)
-    elif hasattr(shape, "has_text_frame") and shape.has_text_frame:
-        copy_text(shape, target_slide)
-    else:
-        # Not handling groups, charts, tables robustly.
-        return
+    `media_cache` (see `new_media_cache`) maps the SHA-256 digest of each image
+    already embedded in the merged deck to its image part, so repeated images
+    (logos, backgrounds) are stored once. New images are built straight from
+    the blob, without copying it into a stream first.
+    """
+    digest = hashlib.sha256(blob).digest()
+    image_part = media_cache.get(digest)
+    if image_part is None:
+        image_part = ImagePart.new(target_part.package, Image.from_blob(blob))
+        media_cache[digest] = image_part
+    return image_part, target_part.relate_to(image_part, RT.IMAGE)
+
+
+def add_picture(target_slide, blob, left, top, width, height, media_cache):
+    """Add a picture shape showing `blob`, reusing an already embedded copy of the image."""
+    image_part, rId = relate_image(target_slide.part, blob, media_cache)
+    shapes = target_slide.shapes
+    pic = shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+    return shapes._shape_factory(pic)
+
+
+def rewire_images(el, source_part, target_part, media_cache):
+    """Point the `<a:blip>` image references in a copied element at the target slide's rels."""
+    for blip in el.iter(BLIP_TAG):
+        for attr in (R_EMBED, R_LINK):
+            rId = blip.get(attr)
+            rel = source_part.rels.get(rId) if rId is not None else None
+            if rel is None:
+                continue
+            if rel.is_external:
+                new_rId = target_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            else:
+                _, new_rId = relate_image(target_part, rel.target_part.blob, media_cache)
+            blip.set(attr, new_rId)
 
 
 def get_master_font_size(source_slide, placeholder_type='body', level=1):
@@ -160,35 +199,50 @@ def get_theme_font_name(source_slide, is_major=False):
     return None
 
 
-def append_slide_from_source(merged_presentation, source_slide, source_presentation):
-    # Create a new slide and copy shapes properly, preserving formatting
-    # and handling image relationships correctly
+def resolve_layouts(presentation):
+    """Return `(by_name, fallback)` for picking the layout of each appended slide.
     
-    # Try to find a matching layout by name from source, otherwise use blank
-    layout = None
-    source_layout_name = source_slide.slide_layout.name
-    
-    # First try to find matching layout by name
-    for candidate_layout in merged_presentation.slide_layouts:
-        if candidate_layout.name == source_layout_name:
-            layout = candidate_layout
-            break
+    `by_name` maps layout names to the first layout with that name; `fallback`
+    is the first blank layout, else layout 6 (commonly blank), else layout 0.
+    Resolve once per merge rather than walking the layouts for every slide.
+    """
+    slide_layouts = list(presentation.slide_layouts)
+    by_name = {}
+    for layout in slide_layouts:
+        by_name.setdefault(layout.name, layout)
+    fallback = next((layout for layout in slide_layouts if 'blank' in layout.name.lower()), None)
+    if fallback is None:
+        fallback = slide_layouts[6] if len(slide_layouts) > 6 else slide_layouts[0]
+    return by_name, fallback
+
+
+def add_empty_slide(presentation, layout):
+    """Append a slide using `layout` but without the layout's placeholder shapes.
     
-    # If no match, look for a blank layout
-    if layout is None:
-        for candidate_layout in merged_presentation.slide_layouts:
-            if 'blank' in candidate_layout.name.lower():
-                layout = candidate_layout
-                break
+    `slides.add_slide()` clones every layout placeholder into the new slide;
+    the merge replaces the whole shape tree with the source's shapes anyway,
+    so create the slide part directly and register it in the slide list.
+    """
+    rId, slide = presentation.part.add_slide(layout)
+    presentation.slides._sldIdLst.add_sldId(rId)
+    return slide
+
+
+def append_slide_from_source(merged_presentation, source_slide, source_presentation, media_cache=None, layouts=None):
+    # Create a new slide and copy shapes properly, preserving formatting
+    # and handling image relationships correctly. Pass the same media_cache
+    # and layouts (from resolve_layouts) for every slide of a merge so
+    # identical images are embedded once and layouts are looked up once.
+    if media_cache is None:
+        media_cache = new_media_cache(merged_presentation)
     
-    # Fallback to layout 6 (commonly blank) or layout 0
-    if layout is None:
-        try:
-            layout = merged_presentation.slide_layouts[6] if len(merged_presentation.slide_layouts) > 6 else merged_presentation.slide_layouts[0]
-        except:
-            layout = merged_presentation.slide_layouts[0]
+    if layouts is None:
+        layouts = resolve_layouts(merged_presentation)
+    by_name, fallback = layouts
+    # Matching layout by name from source, otherwise blank
+    layout = by_name.get(source_slide.slide_layout.name, fallback)
 
-    target_slide = merged_presentation.slides.add_slide(layout)
+    target_slide = add_empty_slide(merged_presentation, layout)
     
     # Copy slide background from source - preserve the exact background
     try:
@@ -202,7 +256,7 @@ def append_slide_from_source(merged_presentation, source_slide, source_presentat
             if target_cSld.bg is not None:
                 target_cSld.remove(target_cSld.bg)
             # Clone and add source background
-            target_cSld.insert(0, deepcopy(source_cSld.bg))
+            target_cSld.insert(0, _clone(source_cSld.bg))
         else:
             # Source doesn't override background (uses master)
             # We need to copy the actual rendered background color
@@ -219,11 +273,14 @@ def append_slide_from_source(merged_presentation, source_slide, source_presentat
                             # Copy theme color reference
                             target_slide.background.fill.fore_color.theme_color = source_fill.fore_color.theme_color
                     elif source_fill.type == 5:  # BACKGROUND (inherits from master)
-                        # Need to get the actual resolved color from the master
-                        # For now, try to access master background
+                        # Need to get the actual resolved color from the master.
+                        # Read its <p:bg>/<p:bgPr> directly: master.background.fill
+                        # would add a <p:bg> to, or replace a bgRef on, the source master
                         try:
-                            master_fill = source_slide.slide_layout.slide_master.background.fill
-                            if master_fill.type == 1:  # SOLID
+                            master_bg = source_slide.slide_layout.slide_master.element.cSld.bg
+                            bgPr = master_bg.bgPr if master_bg is not None else None
+                            master_fill = FillFormat.from_fill_parent(bgPr) if bgPr is not None else None
+                            if master_fill is not None and master_fill.type == 1:  # SOLID
                                 target_slide.background.fill.solid()
                                 if master_fill.fore_color.type == 1:
                                     target_slide.background.fill.fore_color.rgb = master_fill.fore_color.rgb
@@ -233,91 +290,226 @@ def append_slide_from_source(merged_presentation, source_slide, source_presentat
                             pass
             except Exception as e2:
                 print(f"  ⚠️  Could not copy master background color: {e2}")
+            finally:
+                # background.fill added an empty <p:bg> to the source slide; drop it
+                # so the source deck is left as loaded (it may be appended again)
+                if source_cSld.bg is not None:
+                    source_cSld.remove(source_cSld.bg)
     except Exception as e:
         print(f"  ⚠️  Could not copy slide background: {e}")
     
-    # Remove any placeholder shapes from the new slide to start clean
-    # This prevents duplicates when we copy shapes from the source
-    shapes_to_remove = [sp for sp in target_slide.shapes]
-    for shape in shapes_to_remove:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy each shape - for pictures, we need special handling to preserve the image
+    spTree = target_slide.shapes._spTree
+
+    # Copy each shape - for pictures, we need special handling to preserve the image.
+    # Cloned elements are collected and added to the tree in one extend() call;
+    # the batch is flushed before add_picture, which appends to the tree
+    # itself, so the z-order still follows the source.
+    cloned = []
     for shape in source_slide.shapes:
+        el = None
         try:
             # Check if it's a picture - these need special handling for image relationships
-            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                # Copy picture with its image data
-                image = shape.image
-                blob = image.blob
+            if type(shape) is Picture:
+                spTree.extend(cloned)
+                cloned = []
+                # Copy picture with its image data, straight from the source image part
+                blob = shape.part.related_part(shape._element.blip_rId).blob
                 left, top, width, height = shape.left, shape.top, shape.width, shape.height
-                new_pic = target_slide.shapes.add_picture(io.BytesIO(blob), left, top, width, height)
+                new_pic = add_picture(target_slide, blob, left, top, width, height, media_cache)
                 # Try to copy the name
                 try:
                     new_pic.name = shape.name
                 except:
                     pass
             else:
-                # For non-picture shapes, try deepcopy to preserve formatting
-                el = deepcopy(shape._element)
-                target_slide.shapes._spTree.append(el)
+                # For non-picture shapes, clone the XML to preserve formatting
+                el = _clone(shape._element)
+                # Image fills/grouped pictures still carry the source slide's rIds
+                rewire_images(el, source_slide.part, target_slide.part, media_cache)
+                cloned.append(el)
                 
                 # CRITICAL: Preserve bullet formatting from source
                 # If the source paragraph doesn't have explicit bullet settings,
                 # we need to check the source and copy that state
-                if hasattr(shape, 'has_text_frame') and shape.has_text_frame:
-                    # Find the corresponding shape in target
-                    target_shape = None
-                    for ts in target_slide.shapes:
-                        if ts.name == shape.name:
-                            target_shape = ts
-                            break
-                    
-                    if target_shape and hasattr(target_shape, 'has_text_frame') and target_shape.has_text_frame:
-                        # Copy bullet settings and font properties from each paragraph
-                        for src_para, tgt_para in zip(shape.text_frame.paragraphs, target_shape.text_frame.paragraphs):
-                            src_pPr = src_para._element.pPr
-                            tgt_pPr = tgt_para._element.get_or_add_pPr()
-                            
-                            # Check if source has any bullet element
-                            has_bullet_element = False
-                            if src_pPr is not None:
-                                ns = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
-                                buNone = src_pPr.find(f'.//{ns}buNone')
-                                buChar = src_pPr.find(f'.//{ns}buChar')
-                                buAutoNum = src_pPr.find(f'.//{ns}buAutoNum')
-                                has_bullet_element = any([buNone is not None, buChar is not None, buAutoNum is not None])
-                            
-                            # If source has NO explicit bullet element and it's level 0,
-                            # it means "no bullets" - add buNone to target
-                            if not has_bullet_element and src_para.level == 0:
-                                # Remove any existing bullet elements from target
-                                ns = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
-                                for bullet_elem in tgt_pPr.findall(f'.//{ns}buChar') + tgt_pPr.findall(f'.//{ns}buAutoNum'):
-                                    tgt_pPr.remove(bullet_elem)
-                                # Add buNone if not already there
-                                if tgt_pPr.find(f'.//{ns}buNone') is None:
-                                    from lxml import etree
-                                    buNone = etree.SubElement(tgt_pPr, f'{ns}buNone')
-                            
-                            # CRITICAL: Apply explicit formatting from source
-                            # Resolve all theme-dependent values (colors, fonts, sizes) to explicit values
-                            # This ensures exact appearance preservation regardless of theme differences
-                            for src_run, tgt_run in zip(src_para.runs, tgt_para.runs):
-                                apply_explicit_formatting(
-                                    src_run, tgt_run, 
-                                    source_presentation, source_slide,
-                                    shape, src_para
-                                )
+                if el.tag == SP_TAG:
+                    # The corresponding target shape is the clone itself
+                    target_shape = target_slide.shapes._shape_factory(el)
+                    # Copy bullet settings and font properties from each paragraph
+                    for src_para, tgt_para in zip(shape.text_frame.paragraphs, target_shape.text_frame.paragraphs):
+                        src_pPr = src_para._element.pPr
+                        tgt_pPr = tgt_para._element.get_or_add_pPr()
+                        
+                        # Check if source has any bullet element
+                        has_bullet_element = False
+                        if src_pPr is not None:
+                            ns = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+                            buNone = src_pPr.find(f'.//{ns}buNone')
+                            buChar = src_pPr.find(f'.//{ns}buChar')
+                            buAutoNum = src_pPr.find(f'.//{ns}buAutoNum')
+                            has_bullet_element = any([buNone is not None, buChar is not None, buAutoNum is not None])
+                        
+                        # If source has NO explicit bullet element and it's level 0,
+                        # it means "no bullets" - add buNone to target
+                        if not has_bullet_element and src_para.level == 0:
+                            # Remove any existing bullet elements from target
+                            ns = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+                            for bullet_elem in tgt_pPr.findall(f'.//{ns}buChar') + tgt_pPr.findall(f'.//{ns}buAutoNum'):
+                                tgt_pPr.remove(bullet_elem)
+                            # Add buNone if not already there
+                            if tgt_pPr.find(f'.//{ns}buNone') is None:
+                                buNone = etree.SubElement(tgt_pPr, f'{ns}buNone')
+                        
+                        # CRITICAL: Apply explicit formatting from source
+                        # Resolve all theme-dependent values (colors, fonts, sizes) to explicit values
+                        # This ensures exact appearance preservation regardless of theme differences
+                        for src_run, tgt_run in zip(src_para.runs, tgt_para.runs):
+                            apply_explicit_formatting(
+                                src_run, tgt_run, 
+                                source_presentation, source_slide,
+                                shape, src_para
+                            )
 
         except Exception as e:
-            # Deepcopy failed, try manual copy
+            # If only the formatting fix-up failed, the copy is already queued
+            if el is not None and cloned and cloned[-1] is el:
+                continue
             try:
-                copy_shape(shape, target_slide)
+                # Serialize and reparse the shape XML instead of cloning it
+                el = parse_xml(etree.tostring(shape._element))
+                rewire_images(el, source_slide.part, target_slide.part, media_cache)
+                cloned.append(el)
             except Exception as e2:
                 # Log but continue - don't let one shape failure stop the whole merge
                 print(f"  ⚠️  Could not copy shape {shape.name if hasattr(shape, 'name') else 'unnamed'}: {e2}")
+    spTree.extend(cloned)
+
+
+def prefetch_files(paths):
+    """Ask the kernel to start reading `paths` now, so their I/O overlaps.
+    
+    Uses posix_fadvise(WILLNEED) where available (Linux); elsewhere it is a
+    no-op and the files are simply read when they are parsed.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class _ReadOnlyMap(mmap.mmap):
+    # zipfile probes seekable(), which mmap only grew in Python 3.13
+    def seekable(self):
+        return True
+
+
+def open_pptx(path):
+    """`Presentation(path)`, read through a read-only memory map of the file.
+    
+    python-pptx reads every zip member out of the file while loading, so the
+    map is only needed until `Presentation()` returns; the member reads come
+    straight from the page cache instead of through a buffered file object.
+    Load errors are re-raised naming `path`, since python-pptx only sees the map.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = _ReadOnlyMap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and special files can't be mapped
+            return Presentation(path)
+    try:
+        with mm:
+            return Presentation(mm)
+    except PackageNotFoundError as e:
+        raise PackageNotFoundError(f"Package not found at '{path}'") from e
+    except Exception as e:
+        raise ValueError(f"Could not load presentation '{path}': {e}") from e
+
+
+def deck_key(path):
+    """`(dev, inode, mtime_ns, size)` identifying the deck at `path`, or None if it isn't a file.
+    
+    This one stat per input is also the existence check; device and inode
+    identify the file without resolving its real path component by component.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def load_sources(files_to_process):
+    """Yield `(file_path, slides_spec, presentation)` for each existing input, in order.
+    
+    Decks are loaded on a thread pool, LOAD_BATCH at a time, while slides are
+    still appended on the caller's thread. Every part is parsed through the
+    one shared `pptx.oxml.oxml_parser`, which lxml only lets one thread use at
+    a time, so the pool overlaps file reads and zip decompression (and the
+    caller's appending), not the XML parsing itself.
+    An input listed more than once is parsed once and kept only until its
+    last occurrence has been yielded. Parsed decks are full of reference
+    cycles (parts <-> package), so released decks are collected every
+    GC_EVERY instead of whenever the collector next gets to them; callers
+    should drop their own reference before asking for the next deck.
+    """
+    # Stat every input once, up front
+    keys = [deck_key(file_path) for file_path, _ in files_to_process]
+    remaining = Counter(key for key in keys if key is not None)
+    decks = {}
+    released = 0
+    workers = min(LOAD_BATCH, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(files_to_process), LOAD_BATCH):
+            batch = files_to_process[start:start + LOAD_BATCH]
+            batch_keys = keys[start:start + LOAD_BATCH]
+            new = {}
+            for (file_path, _), key in zip(batch, batch_keys):
+                if key is not None and key not in decks:
+                    new.setdefault(key, file_path)
+            prefetch_files(new.values())
+            for key, file_path in new.items():
+                decks[key] = executor.submit(open_pptx, file_path)
+            for (file_path, slides_spec), key in zip(batch, batch_keys):
+                if key is None:
+                    print(f"Warning: input file not found: {file_path}")
+                    continue
+                future = decks[key]
+                remaining[key] -= 1
+                if remaining[key]:
+                    yield file_path, slides_spec, future.result()
+                    continue
+                del decks[key]
+                yield file_path, slides_spec, future.result()
+                del future
+                released += 1
+                if released % GC_EVERY == 0:
+                    gc.collect()
+
+
+def append_slides(merged, src, slides_spec, file_path, media_cache, layouts):
+    """Append the slides of `src` picked by `slides_spec` ('all' or a list of indexes)."""
+    if slides_spec == 'all':
+        # Copy all slides
+        for slide in src.slides:
+            append_slide_from_source(merged, slide, src, media_cache, layouts)
+    else:
+        # Copy specific slides by index
+        for slide_idx in slides_spec:
+            if 0 <= slide_idx < len(src.slides):
+                append_slide_from_source(merged, src.slides[slide_idx], src, media_cache, layouts)
+            else:
+                print(f"Warning: slide index {slide_idx} out of range in {file_path}")
 
 
 def load_config(config_path):
@@ -406,34 +598,22 @@ def merge_presentations(output_file, input_files, parts_config=None):
         
         # Load first file to get the template structure (masters, layouts, theme)
         first_file = files_to_process[0][0]
-        base_prs = Presentation(first_file)
         # Create merged presentation inheriting from the first file's structure
-        merged = Presentation(first_file)
+        merged = open_pptx(first_file)
         # Remove all slides from the base - we'll add them back properly
         while len(merged.slides) > 0:
             rId = merged.slides._sldIdLst[0].rId
             merged.part.drop_rel(rId)
             del merged.slides._sldIdLst[0]
         
+        # Images already embedded in the merged deck, by content hash
+        media_cache = new_media_cache(merged)
+        layouts = resolve_layouts(merged)
         # Now copy slides from all input files according to config
-        for file_path, slides_spec in files_to_process:
-            if not os.path.isfile(file_path):
-                print(f"Warning: input file not found: {file_path}")
-                continue
-            
-            src = Presentation(file_path)
-            
-            if slides_spec == 'all':
-                # Copy all slides
-                for slide in src.slides:
-                    append_slide_from_source(merged, slide, src)
-            else:
-                # Copy specific slides by index
-                for slide_idx in slides_spec:
-                    if 0 <= slide_idx < len(src.slides):
-                        append_slide_from_source(merged, src.slides[slide_idx], src)
-                    else:
-                        print(f"Warning: slide index {slide_idx} out of range in {file_path}")
+        for file_path, slides_spec, src in load_sources(files_to_process):
+            append_slides(merged, src, slides_spec, file_path, media_cache, layouts)
+            # Let load_sources free the deck once it isn't needed again
+            del src
     elif template_path:
         merged = Presentation(template_path)
     else:
@@ -488,11 +668,11 @@ def main():
     if not input_files and not parts_config:
         if os.path.isdir(TEMPLATES_DIR):
             # Filter out PowerPoint lock/temp files (starting with ~$)
-            input_files = [
-                os.path.join(TEMPLATES_DIR, n) 
-                for n in sorted(os.listdir(TEMPLATES_DIR))
-                if n.lower().endswith(".pptx") and not n.startswith("~$")
-            ]
+            with os.scandir(TEMPLATES_DIR) as it:
+                input_files = sorted(
+                    e.path for e in it
+                    if e.name.lower().endswith(".pptx") and not e.name.startswith("~$") and e.is_file()
+                )
 
     # If a template was explicitly provided via CLI, set it and ensure it exists
     cli_template = None
@@ -3,8 +3,14 @@ Helper functions to resolve theme-dependent values (colors, fonts) from source p
 and convert them to explicit values that don't depend on the target's theme.
 """
 from pptx.util import Pt
-from pptx.enum.dml import MSO_THEME_COLOR
-from copy import deepcopy
+from pptx.enum.dml import MSO_FILL
+
+
+# Placeholder type (PP_PLACEHOLDER value) -> master text style category
+_PH_TYPE_MAP = {
+    1: 'title',  # TITLE
+    2: 'body',   # BODY
+}
 
 
 def get_theme_color_rgb(presentation, theme_color_idx):
@@ -96,16 +102,22 @@ def resolve_run_color_to_rgb(run, source_presentation):
         RGB string like 'FF0000' or None if no color
     """
     try:
-        if not run.font.color.type:
+        # Check the fill first: font.color would turn any other fill into an
+        # empty solidFill on the source run
+        fill = run.font.fill
+        if fill.type != MSO_FILL.SOLID:
+            return None
+        color = fill.fore_color
+        if not color.type:
             return None
         
-        if run.font.color.type == 1:  # RGB
+        if color.type == 1:  # RGB
             # Already RGB
-            return str(run.font.color.rgb)
+            return str(color.rgb)
         
-        if run.font.color.type == 2:  # SCHEME
+        if color.type == 2:  # SCHEME
             # Resolve scheme color to RGB from source theme
-            theme_color = run.font.color.theme_color
+            theme_color = color.theme_color
             rgb = get_theme_color_rgb(source_presentation, theme_color)
             return rgb
     except:
@@ -188,26 +200,22 @@ def apply_explicit_formatting(source_run, target_run, source_presentation, sourc
     
     This ensures the target run looks exactly like the source, regardless of theme differences.
     """
-    from pptx.util import Pt
     from pptx.dml.color import RGBColor
     
+    # Resolve the placeholder type once; both the size and font lookups need it
+    ph_type = None
+    if getattr(shape, 'is_placeholder', False):
+        try:
+            ph_type = shape.placeholder_format.type
+        except:
+            pass
+    
     # 1. Font Size - ALWAYS make explicit
     if source_run.font.size:
         target_run.font.size = source_run.font.size
     else:
         # Get from master default
-        placeholder_type = 'body'
-        if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-            try:
-                ph_type = shape.placeholder_format.type
-                if ph_type == 1:
-                    placeholder_type = 'title'
-                elif ph_type == 2:
-                    placeholder_type = 'body'
-                else:
-                    placeholder_type = 'other'
-            except:
-                pass
+        placeholder_type = 'body' if ph_type is None else _PH_TYPE_MAP.get(ph_type, 'other')
         
         font_size = get_master_font_size(source_slide, placeholder_type, para.level + 1)
         if font_size:
@@ -224,13 +232,7 @@ def apply_explicit_formatting(source_run, target_run, source_presentation, sourc
         target_run.font.name = source_run.font.name
     else:
         # Get theme font
-        is_major = False
-        if hasattr(shape, 'is_placeholder') and shape.is_placeholder:
-            try:
-                if shape.placeholder_format.type == 1:  # TITLE
-                    is_major = True
-            except:
-                pass
+        is_major = _PH_TYPE_MAP.get(ph_type) == 'title'
         
         theme_font = get_theme_font_name_from_prs(source_presentation, is_major)
         if theme_font:
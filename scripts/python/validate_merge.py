@@ -9,6 +9,7 @@ Usage:
 import argparse
 import sys
 import os
+from dataclasses import dataclass, field
 from pptx import Presentation
 
 # Add parent directory to path to import theme_resolver
@@ -16,12 +17,89 @@ sys.path.insert(0, os.path.dirname(__file__))
 from theme_resolver import get_theme_color_rgb
 
 
-def validate_slide_count(merged_path, source_paths):
-    """Verify total slide count matches expectation."""
-    merged = Presentation(merged_path)
-    expected_slides = sum(len(Presentation(src).slides) for src in source_paths)
-    actual_slides = len(merged.slides)
+@dataclass
+class ValidationResult:
+    """Metrics collected for one source/merged slide pair."""
+    slide_idx: int
+    src_shape_count: int = 0
+    merged_shape_count: int = 0
+    text_issues: list = field(default_factory=list)
+    image_issues: list = field(default_factory=list)
+    total_images: int = 0
+    total_runs: int = 0
+    explicit_sizes: int = 0
+    rgb_colors: int = 0
+    scheme_colors: int = 0
+
+
+def collect_slide_results(src_slide, merged_slide, slide_idx):
+    """Walk one source/merged slide pair once, gathering every check's metrics."""
+    result = ValidationResult(slide_idx)
+    src_shapes = list(src_slide.shapes)
+    merged_shapes = list(merged_slide.shapes)
+    result.src_shape_count = len(src_shapes)
+    result.merged_shape_count = len(merged_shapes)
     
+    # Text content
+    for src_shape, merged_shape in zip(src_shapes, merged_shapes):
+        if hasattr(src_shape, 'text') and hasattr(merged_shape, 'text'):
+            if src_shape.text.strip() != merged_shape.text.strip():
+                result.text_issues.append(f"Slide {slide_idx}, Shape {src_shape.name}: Text mismatch")
+    
+    # Images
+    for src_shape in src_shapes:
+        if src_shape.shape_type == 13:  # PICTURE
+            result.total_images += 1
+            # Find corresponding shape in merged
+            merged_shape = None
+            for ms in merged_shapes:
+                if ms.name == src_shape.name and ms.shape_type == 13:
+                    merged_shape = ms
+                    break
+            
+            if not merged_shape:
+                result.image_issues.append(f"Slide {slide_idx}: Image {src_shape.name} missing")
+            else:
+                try:
+                    src_size = len(src_shape.image.blob)
+                    merged_size = len(merged_shape.image.blob)
+                    if src_size != merged_size:
+                        result.image_issues.append(f"Slide {slide_idx}: Image {src_shape.name} size mismatch")
+                except Exception as e:
+                    result.image_issues.append(f"Slide {slide_idx}: Image {src_shape.name} error: {e}")
+    
+    # Formatting
+    for merged_shape in merged_shapes:
+        if hasattr(merged_shape, 'has_text_frame') and merged_shape.has_text_frame:
+            for para in merged_shape.text_frame.paragraphs:
+                for run in para.runs:
+                    result.total_runs += 1
+                    
+                    # Check font size
+                    if run.font.size:
+                        result.explicit_sizes += 1
+                    
+                    # Check color type
+                    try:
+                        if run.font.color.type == 1:  # RGB
+                            result.rgb_colors += 1
+                        elif run.font.color.type == 2:  # SCHEME
+                            result.scheme_colors += 1
+                    except:
+                        pass
+    
+    return result
+
+
+def print_issues(issues):
+    for issue in issues[:5]:  # Show first 5 issues
+        print(f"   {issue}")
+    if len(issues) > 5:
+        print(f"   ... and {len(issues) - 5} more issues")
+
+
+def validate_slide_count(expected_slides, actual_slides):
+    """Verify total slide count matches expectation."""
     status = "✅" if actual_slides == expected_slides else "❌"
     print(f"\n{status} Slide Count:")
     print(f"   Expected: {expected_slides} slides")
@@ -29,170 +107,61 @@ def validate_slide_count(merged_path, source_paths):
     return actual_slides == expected_slides
 
 
-def validate_shapes(merged_path, source_paths):
+def validate_shapes(slide_results, missing_slides):
     """Verify shapes were copied correctly."""
-    merged = Presentation(merged_path)
-    all_sources = [Presentation(src) for src in source_paths]
-    
     issues = []
-    slide_idx = 0
-    
-    for src_prs in all_sources:
-        for src_slide in src_prs.slides:
-            if slide_idx >= len(merged.slides):
-                issues.append(f"Slide {slide_idx}: Missing in merged output")
-                continue
-            
-            merged_slide = merged.slides[slide_idx]
-            src_shape_count = len(src_slide.shapes)
-            merged_shape_count = len(merged_slide.shapes)
-            
-            if src_shape_count != merged_shape_count:
-                issues.append(f"Slide {slide_idx}: Shape count mismatch (src: {src_shape_count}, merged: {merged_shape_count})")
-            
-            slide_idx += 1
+    for r in slide_results:
+        if r.src_shape_count != r.merged_shape_count:
+            issues.append(f"Slide {r.slide_idx}: Shape count mismatch (src: {r.src_shape_count}, merged: {r.merged_shape_count})")
+    for slide_idx in missing_slides:
+        issues.append(f"Slide {slide_idx}: Missing in merged output")
     
     status = "✅" if not issues else "❌"
     print(f"\n{status} Shapes:")
     if issues:
-        for issue in issues[:5]:  # Show first 5 issues
-            print(f"   {issue}")
-        if len(issues) > 5:
-            print(f"   ... and {len(issues) - 5} more issues")
+        print_issues(issues)
     else:
-        print(f"   All {slide_idx} slides have correct shape counts")
+        print(f"   All {len(slide_results)} slides have correct shape counts")
     
     return len(issues) == 0
 
 
-def validate_text_content(merged_path, source_paths):
+def validate_text_content(slide_results):
     """Verify text content was preserved."""
-    merged = Presentation(merged_path)
-    all_sources = [Presentation(src) for src in source_paths]
-    
-    issues = []
-    slide_idx = 0
-    
-    for src_prs in all_sources:
-        for src_slide in src_prs.slides:
-            if slide_idx >= len(merged.slides):
-                continue
-            
-            merged_slide = merged.slides[slide_idx]
-            
-            for src_shape, merged_shape in zip(src_slide.shapes, merged_slide.shapes):
-                if hasattr(src_shape, 'text') and hasattr(merged_shape, 'text'):
-                    if src_shape.text.strip() != merged_shape.text.strip():
-                        issues.append(f"Slide {slide_idx}, Shape {src_shape.name}: Text mismatch")
-            
-            slide_idx += 1
+    issues = [issue for r in slide_results for issue in r.text_issues]
     
     status = "✅" if not issues else "❌"
     print(f"\n{status} Text Content:")
     if issues:
-        for issue in issues[:5]:
-            print(f"   {issue}")
-        if len(issues) > 5:
-            print(f"   ... and {len(issues) - 5} more issues")
+        print_issues(issues)
     else:
         print(f"   All text content preserved correctly")
     
     return len(issues) == 0
 
 
-def validate_images(merged_path, source_paths):
+def validate_images(slide_results):
     """Verify images were copied with correct data."""
-    merged = Presentation(merged_path)
-    all_sources = [Presentation(src) for src in source_paths]
-    
-    issues = []
-    total_images = 0
-    slide_idx = 0
-    
-    for src_prs in all_sources:
-        for src_slide in src_prs.slides:
-            if slide_idx >= len(merged.slides):
-                continue
-            
-            merged_slide = merged.slides[slide_idx]
-            
-            for src_shape in src_slide.shapes:
-                if src_shape.shape_type == 13:  # PICTURE
-                    total_images += 1
-                    # Find corresponding shape in merged
-                    merged_shape = None
-                    for ms in merged_slide.shapes:
-                        if ms.name == src_shape.name and ms.shape_type == 13:
-                            merged_shape = ms
-                            break
-                    
-                    if not merged_shape:
-                        issues.append(f"Slide {slide_idx}: Image {src_shape.name} missing")
-                    else:
-                        try:
-                            src_size = len(src_shape.image.blob)
-                            merged_size = len(merged_shape.image.blob)
-                            if src_size != merged_size:
-                                issues.append(f"Slide {slide_idx}: Image {src_shape.name} size mismatch")
-                        except Exception as e:
-                            issues.append(f"Slide {slide_idx}: Image {src_shape.name} error: {e}")
-            
-            slide_idx += 1
+    issues = [issue for r in slide_results for issue in r.image_issues]
+    total_images = sum(r.total_images for r in slide_results)
     
     status = "✅" if not issues else "❌"
     print(f"\n{status} Images:")
     print(f"   Total images: {total_images}")
     if issues:
-        for issue in issues[:5]:
-            print(f"   {issue}")
-        if len(issues) > 5:
-            print(f"   ... and {len(issues) - 5} more issues")
+        print_issues(issues)
     else:
         print(f"   All images copied correctly")
     
     return len(issues) == 0
 
 
-def validate_formatting(merged_path, source_paths):
+def validate_formatting(slide_results):
     """Verify formatting (sizes, colors) was preserved."""
-    merged = Presentation(merged_path)
-    all_sources = [Presentation(src) for src in source_paths]
-    
-    issues = []
-    total_runs = 0
-    explicit_sizes = 0
-    scheme_colors = 0
-    rgb_colors = 0
-    slide_idx = 0
-    
-    for src_prs in all_sources:
-        for src_slide in src_prs.slides:
-            if slide_idx >= len(merged.slides):
-                continue
-            
-            merged_slide = merged.slides[slide_idx]
-            
-            for merged_shape in merged_slide.shapes:
-                if hasattr(merged_shape, 'has_text_frame') and merged_shape.has_text_frame:
-                    for para in merged_shape.text_frame.paragraphs:
-                        for run in para.runs:
-                            total_runs += 1
-                            
-                            # Check font size
-                            if run.font.size:
-                                explicit_sizes += 1
-                            
-                            # Check color type
-                            try:
-                                if run.font.color.type == 1:  # RGB
-                                    rgb_colors += 1
-                                elif run.font.color.type == 2:  # SCHEME
-                                    scheme_colors += 1
-                                    issues.append(f"Slide {slide_idx}: SCHEME color not converted to RGB")
-                            except:
-                                pass
-            
-            slide_idx += 1
+    total_runs = sum(r.total_runs for r in slide_results)
+    explicit_sizes = sum(r.explicit_sizes for r in slide_results)
+    rgb_colors = sum(r.rgb_colors for r in slide_results)
+    scheme_colors = sum(r.scheme_colors for r in slide_results)
     
     status = "✅" if scheme_colors == 0 else "⚠️"
     print(f"\n{status} Formatting:")
@@ -252,13 +221,24 @@ def main():
         print(f"  - {src}")
     print("=" * 70)
     
+    # Load every presentation once and walk all slide pairs in a single pass
+    merged = Presentation(args.merged)
+    all_src_slides = [slide for src in source_paths for slide in Presentation(src).slides]
+    merged_slides = list(merged.slides)
+    
+    slide_results = [
+        collect_slide_results(src_slide, merged_slide, slide_idx)
+        for slide_idx, (src_slide, merged_slide) in enumerate(zip(all_src_slides, merged_slides))
+    ]
+    missing_slides = range(len(merged_slides), len(all_src_slides))
+    
     # Run all validations
     results = []
-    results.append(("Slide Count", validate_slide_count(args.merged, source_paths)))
-    results.append(("Shapes", validate_shapes(args.merged, source_paths)))
-    results.append(("Text Content", validate_text_content(args.merged, source_paths)))
-    results.append(("Images", validate_images(args.merged, source_paths)))
-    results.append(("Formatting", validate_formatting(args.merged, source_paths)))
+    results.append(("Slide Count", validate_slide_count(len(all_src_slides), len(merged_slides))))
+    results.append(("Shapes", validate_shapes(slide_results, missing_slides)))
+    results.append(("Text Content", validate_text_content(slide_results)))
+    results.append(("Images", validate_images(slide_results)))
+    results.append(("Formatting", validate_formatting(slide_results)))
     
     # Summary
     print("\n" + "=" * 70)
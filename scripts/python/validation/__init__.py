@@ -0,0 +1 @@
+"""Validation scripts for merged PPTX output. Run `python -m validation --help`."""
@@ -0,0 +1,49 @@
+"""
+Run the merged-deck validation checks from one process.
+
+Usage:
+  python -m validation all
+  python -m validation deep [--quiet]
+  python -m validation fonts sizes bullets xml
+
+All checks load their decks through `_prs_cache.load_prs` and
+`_lazy_prs.open_slide_xml`, so running several of them together parses each
+file once instead of once per script.
+"""
+import argparse
+import os
+import sys
+
+# The individual scripts import their helpers as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import deep_compare
+import final_font_check
+import final_validation
+import show_xml
+import validate_font_sizes
+
+CHECKS = {
+    'deep': lambda args: deep_compare.main(quiet=args.quiet),
+    'fonts': lambda args: final_font_check.main(),
+    'sizes': lambda args: validate_font_sizes.main(),
+    'bullets': lambda args: final_validation.main(),
+    'xml': lambda args: show_xml.main(),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m validation', description='Run merged PPTX validation checks')
+    parser.add_argument('checks', nargs='+', choices=list(CHECKS) + ['all'], help="Checks to run, or 'all'")
+    parser.add_argument('--quiet', '-q', action='store_true', help="Skip the per-shape dump in 'deep'")
+    args = parser.parse_args()
+    
+    names = list(CHECKS) if 'all' in args.checks else args.checks
+    for name in names:
+        CHECKS[name](args)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Side-effect free run color lookup for the validation scripts.
+
+python-pptx's `run.font.color` calls `fill.solid()` when the run has no
+solid fill, so merely *reading* a color through it rewrites the run XML and
+re-walks the tree on every attribute access. `read_color` inspects the
+`<a:rPr>/<a:solidFill>` element directly instead.
+"""
+import weakref
+
+from pptx.enum.dml import MSO_COLOR_TYPE, MSO_THEME_COLOR
+
+NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+RPR_TAG = f'{NS_A}rPr'
+SOLID_FILL_TAG = f'{NS_A}solidFill'
+
+# Color choice element tag -> MSO_COLOR_TYPE for the kinds we don't unpack
+_OTHER_COLOR_TYPES = {
+    f'{NS_A}hslClr': MSO_COLOR_TYPE.HSL,
+    f'{NS_A}prstClr': MSO_COLOR_TYPE.PRESET,
+    f'{NS_A}scrgbClr': MSO_COLOR_TYPE.SCRGB,
+    f'{NS_A}sysClr': MSO_COLOR_TYPE.SYSTEM,
+}
+
+# <a:r> -> color. Weak keys, so an entry lives only as long as the run's
+# element proxy and no slide tree is kept alive by the cache
+_color_cache = weakref.WeakKeyDictionary()
+
+
+def _parse_color(r):
+    rPr = r.find(RPR_TAG)
+    if rPr is None:
+        return None
+    solidFill = rPr.find(SOLID_FILL_TAG)
+    if solidFill is None or len(solidFill) == 0:
+        return None
+    clr = solidFill[0]
+    if clr.tag == f'{NS_A}srgbClr':
+        return ('RGB', clr.get('val', '').upper())
+    if clr.tag == f'{NS_A}schemeClr':
+        return ('SCHEME', MSO_THEME_COLOR.from_xml(clr.get('val')))
+    color_type = _OTHER_COLOR_TYPES.get(clr.tag)
+    return ('TYPE', color_type) if color_type is not None else None
+
+
+def read_color(run):
+    """Return ('RGB', hex), ('SCHEME', MSO_THEME_COLOR), ('TYPE', MSO_COLOR_TYPE) or None.
+    
+    Accepts a python-pptx run or a raw `<a:r>` element.
+    """
+    r = getattr(run, '_r', run)
+    try:
+        return _color_cache[r]
+    except KeyError:
+        pass
+    except TypeError:
+        # Plain lxml elements (not parsed with python-pptx's parser) can't be weakly referenced
+        return _parse_color(r)
+    color = _parse_color(r)
+    _color_cache[r] = color
+    return color
+
+
+def format_color(color):
+    """Render a read_color() result the way the reports print it, e.g. RGB(C00000)."""
+    if color is None:
+        return 'None'
+    kind, value = color
+    return f'{kind}({value})'
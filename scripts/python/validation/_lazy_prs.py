@@ -0,0 +1,59 @@
+"""
+Read individual slide parts straight from a PPTX zip.
+
+`Presentation()` parses every slide, layout, master and media part up
+front. Scripts that only look at one or two slides can instead resolve the
+slide's part name from `presentation.xml` and parse just that XML.
+"""
+import functools
+import posixpath
+import zipfile
+
+from lxml import etree
+from pptx.oxml import parse_xml
+from pptx.shapes.shapetree import SlideShapeFactory
+
+NS_P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+NS_R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def slide_partnames(zf):
+    """Zip member names of the slides, in presentation order."""
+    rels = etree.fromstring(zf.read('ppt/_rels/presentation.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{NS_REL}Relationship')}
+    prs = etree.fromstring(zf.read('ppt/presentation.xml'))
+    names = []
+    for sldId in prs.iter(f'{NS_P}sldId'):
+        target = targets[sldId.get(f'{NS_R}id')]
+        if target.startswith('/'):
+            names.append(target.lstrip('/'))
+        else:
+            names.append(posixpath.normpath(posixpath.join('ppt', target)))
+    return names
+
+
+def read_slide_bytes(pptx_path, slide_idx):
+    """Raw XML bytes of slide `slide_idx` (0-based), without parsing it."""
+    with zipfile.ZipFile(pptx_path) as zf:
+        return zf.read(slide_partnames(zf)[slide_idx])
+
+
+@functools.lru_cache(maxsize=32)
+def open_slide_xml(pptx_path, slide_idx):
+    """Return the `<p:sld>` root element of slide `slide_idx` (0-based).
+    
+    The XML is parsed with python-pptx's parser, so it has the usual oxml
+    element classes, but no other part of the package is loaded. Results are
+    cached, so treat the returned tree as read-only.
+    """
+    return parse_xml(read_slide_bytes(pptx_path, slide_idx))
+
+
+def slide_shapes(sld):
+    """python-pptx shape proxies for the top-level shapes of a `<p:sld>` element.
+    
+    The proxies have no parent part, so relationship-backed features such as
+    `shape.image` are unavailable; text and placeholder properties work.
+    """
+    return [SlideShapeFactory(elm, None) for elm in sld.cSld.spTree.iter_shape_elms()]
@@ -0,0 +1,29 @@
+"""
+Shared Presentation loader for the validation scripts.
+
+Parsing a PPTX unzips and parses every part, so scripts that are chained
+together in one process should load each file through `load_prs` and reuse
+the parsed object instead of calling `Presentation()` again.
+"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from pptx import Presentation
+
+
+@functools.lru_cache(maxsize=8)
+def load_prs(path):
+    """Open `path` with python-pptx, returning the cached object on repeat calls."""
+    return Presentation(path)
+
+
+def load_prs_parallel(*paths):
+    """Load several presentations concurrently, returning them in argument order.
+    
+    Every part is parsed through python-pptx's one shared `oxml_parser`, which
+    lxml only lets one thread use at a time, so the XML parsing itself does not
+    overlap; the thread pool overlaps the file reads and zip inflating (zlib
+    releases the GIL) of one deck with the parsing of another.
+    """
+    with ThreadPoolExecutor(max_workers=len(paths) or 1) as ex:
+        return list(ex.map(load_prs, paths))
@@ -0,0 +1,65 @@
+"""
+Shared source-vs-merged run walk for the single-slide checks.
+
+`compare_runs` pairs up the text runs of a source slide and its merged copy
+and evaluates every requested check on both sides in the same pass, so the
+scripts only decide what to print.
+"""
+from collections import namedtuple
+
+from _lazy_prs import open_slide_xml, slide_shapes
+
+NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P_TAG = f'{NS_A}p'
+R_TAG = f'{NS_A}r'
+
+ShapePair = namedtuple('ShapePair', 'slide_idx shape_idx src_shape merged_shape runs')
+# values maps each check name to its (source, merged) result
+RunPair = namedtuple('RunPair', 'para_idx run_idx text values')
+
+
+def font_name(r):
+    """Explicit latin typeface of an <a:r>, or None."""
+    rPr = r.rPr
+    latin = rPr.latin if rPr is not None else None
+    return latin.typeface if latin is not None else None
+
+
+def font_size(r):
+    """Explicit font size of an <a:r> in points, or None."""
+    rPr = r.rPr
+    sz = rPr.sz if rPr is not None else None
+    return sz / 100 if sz is not None else None
+
+
+def _run_pairs(src_shape, merged_shape, checks):
+    src_paras = src_shape.text_frame._txBody.iterchildren(P_TAG)
+    merged_paras = merged_shape.text_frame._txBody.iterchildren(P_TAG)
+    for para_idx, (src_para, merged_para) in enumerate(zip(src_paras, merged_paras)):
+        if not src_para.text.strip():
+            continue
+        src_runs = src_para.iterchildren(R_TAG)
+        merged_runs = merged_para.iterchildren(R_TAG)
+        for run_idx, (src_r, merged_r) in enumerate(zip(src_runs, merged_runs)):
+            text = src_r.text
+            if not text.strip():
+                continue
+            values = {name: (extract(src_r), extract(merged_r)) for name, extract in checks}
+            yield RunPair(para_idx, run_idx, text, values)
+
+
+def compare_runs(src_path, merged_path, mapping, checks):
+    """Yield a ShapePair for every text shape of each (src_idx, merged_idx) slide pair.
+
+    `checks` is a list of (name, extractor) pairs; each extractor takes an
+    `<a:r>` element. Blank paragraphs and runs are skipped. Only the mapped
+    slide parts are parsed, via `open_slide_xml`.
+    """
+    for src_idx, merged_idx in mapping:
+        src_shapes = slide_shapes(open_slide_xml(src_path, src_idx))
+        merged_shapes = slide_shapes(open_slide_xml(merged_path, merged_idx))
+        for shape_idx, (src_shape, merged_shape) in enumerate(zip(src_shapes, merged_shapes)):
+            if not (hasattr(src_shape, 'has_text_frame') and src_shape.has_text_frame):
+                continue
+            runs = list(_run_pairs(src_shape, merged_shape, checks))
+            yield ShapePair(merged_idx, shape_idx, src_shape, merged_shape, runs)
@@ -1,58 +1,131 @@
-from pptx import Presentation
+import contextlib
+import io
+import sys
+from collections import namedtuple
+
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
+from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE, MSO_UNDERLINE
+
+from _prs_cache import load_prs_parallel
+from _colors import read_color, format_color
+
+# Fixed-field records for the per-run/per-paragraph analysis; cheaper to
+# build and smaller than one dict per run
+RunInfo = namedtuple('RunInfo', 'text font_name font_size bold italic underline color')
+ParaInfo = namedtuple('ParaInfo', 'text level alignment runs')
+TextInfo = namedtuple('TextInfo', 'shape_name text paragraphs')
+
+NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P_TAG = f'{NS_A}p'
+R_TAG = f'{NS_A}r'
+
+def iter_runs(prs):
+    """Yield (slide_idx, shape_idx, para_idx, run_idx, run, para, shape) for every text run."""
+    for slide_idx, slide in enumerate(prs.slides):
+        for shape_idx, shape in enumerate(slide.shapes):
+            if not hasattr(shape, 'has_text_frame') or not shape.has_text_frame:
+                continue
+            for para_idx, para in enumerate(shape.text_frame.paragraphs):
+                for run_idx, run in enumerate(para.runs):
+                    yield slide_idx, shape_idx, para_idx, run_idx, run, para, shape
+
+def run_columns(prs):
+    """Flatten every run of a deck into parallel lists, one per field."""
+    cols = {name: [] for name in ('slide', 'shape', 'para', 'run', 'font_size', 'color')}
+    slides, shapes, paras, runs = cols['slide'], cols['shape'], cols['para'], cols['run']
+    font_sizes, colors = cols['font_size'], cols['color']
+    for slide_idx, shape_idx, para_idx, run_idx, run, _, _ in iter_runs(prs):
+        slides.append(slide_idx)
+        shapes.append(shape_idx)
+        paras.append(para_idx)
+        runs.append(run_idx)
+        size = run.font.size
+        font_sizes.append(size.pt if size else None)
+        colors.append(format_color(read_color(run)))
+    return cols
+
+def diff_runs(src_cols, mrg_cols, differences):
+    """Report color/size differences between two run_columns() tables.
+    
+    Runs are compared up to the first position where the two decks' run
+    layouts stop lining up.
+    """
+    src_keys = list(zip(src_cols['slide'], src_cols['shape'], src_cols['para'], src_cols['run']))
+    mrg_keys = list(zip(mrg_cols['slide'], mrg_cols['shape'], mrg_cols['para'], mrg_cols['run']))
+    aligned = min(len(src_keys), len(mrg_keys))
+    diverged_at = next((i for i, (a, b) in enumerate(zip(src_keys, mrg_keys)) if a != b), None)
+    if diverged_at is not None:
+        aligned = diverged_at
+    
+    color_diffs = {i for i, (a, b) in enumerate(zip(src_cols['color'][:aligned], mrg_cols['color'][:aligned])) if a != b}
+    size_diffs = {i for i, (a, b) in enumerate(zip(src_cols['font_size'][:aligned], mrg_cols['font_size'][:aligned])) if a != b}
+    
+    for i in sorted(color_diffs | size_diffs):
+        slide_idx, shape_idx, para_idx, run_idx = src_keys[i]
+        label = f'Shape {shape_idx} Para {para_idx} Run {run_idx}'
+        if i in color_diffs:
+            print(f'  ❌ {label}: Color mismatch')
+            print(f'      Source: {src_cols["color"][i]}')
+            print(f'      Merged: {mrg_cols["color"][i]}')
+            differences.append(f'Slide {slide_idx + 1} Shape {shape_idx}: Color differs')
+        if i in size_diffs:
+            print(f'  ❌ {label}: Font size mismatch ({src_cols["font_size"][i]} vs {mrg_cols["font_size"][i]})')
+            differences.append(f'Slide {slide_idx + 1} Shape {shape_idx}: Font size differs')
+    
+    if diverged_at is not None:
+        slide_idx, shape_idx, para_idx, run_idx = src_keys[diverged_at]
+        print(f'  ❌ Slide {slide_idx + 1} Shape {shape_idx} Para {para_idx} Run {run_idx}: Run layout differs from merged')
+        differences.append(f'Slide {slide_idx + 1} Shape {shape_idx}: Run layout differs')
+
+def _underline(u):
+    """Map an rPr/@u value the same way python-pptx's Font.underline does."""
+    if u is MSO_UNDERLINE.NONE:
+        return False
+    if u is MSO_UNDERLINE.SINGLE_LINE:
+        return True
+    return u
 
 def analyze_text_properties(shape, shape_name):
     """Extract detailed text properties from a shape."""
     if not hasattr(shape, 'has_text_frame') or not shape.has_text_frame:
         return None
     
-    details = {
-        'shape_name': shape_name,
-        'text': shape.text,
-        'paragraphs': []
-    }
-    
-    for para_idx, para in enumerate(shape.text_frame.paragraphs):
-        para_info = {
-            'text': para.text,
-            'level': para.level,
-            'alignment': str(para.alignment) if para.alignment else 'None',
-            'has_bullet': False,
-            'runs': []
-        }
-        
-        # Check bullet/numbering
-        if para.font.size:
-            para_info['bullet'] = 'has bullet' if para.level > 0 else 'no bullet'
-        
-        for run_idx, run in enumerate(para.runs):
-            run_info = {
-                'text': run.text,
-                'font_name': run.font.name,
-                'font_size': run.font.size.pt if run.font.size else None,
-                'bold': run.font.bold,
-                'italic': run.font.italic,
-                'underline': run.font.underline,
-            }
-            
-            # Color
-            if run.font.color.type:
-                if run.font.color.type == 1:  # RGB
-                    run_info['color'] = f'RGB({run.font.color.rgb})'
-                elif run.font.color.type == 2:  # SCHEME
-                    run_info['color'] = f'SCHEME({run.font.color.theme_color})'
-                else:
-                    run_info['color'] = f'TYPE({run.font.color.type})'
-            else:
-                run_info['color'] = 'None'
-            
-            para_info['runs'].append(run_info)
+    # Walk the <a:p>/<a:r> elements directly; the _Paragraph/_Run/Font
+    # wrappers cost an object per access (and add an empty pPr/rPr on read)
+    txBody = shape.text_frame._txBody
+    para_infos = []
+    for p_elem in txBody.iterchildren(P_TAG):
+        runs = []
+        for r_elem in p_elem.iterchildren(R_TAG):
+            rPr = r_elem.rPr
+            if rPr is None:
+                runs.append(RunInfo(r_elem.text, None, None, None, None, None, format_color(None)))
+                continue
+            latin = rPr.latin
+            sz = rPr.sz
+            runs.append(RunInfo(
+                r_elem.text,
+                latin.typeface if latin is not None else None,
+                sz / 100 if sz is not None else None,
+                rPr.b,
+                rPr.i,
+                _underline(rPr.u),
+                format_color(read_color(r_elem)),
+            ))
         
-        details['paragraphs'].append(para_info)
+        pPr = p_elem.pPr
+        alignment = pPr.algn if pPr is not None else None
+        para_infos.append(ParaInfo(
+            p_elem.text,
+            pPr.lvl if pPr is not None else 0,
+            str(alignment) if alignment else 'None',
+            runs,
+        ))
     
-    return details
+    # Same as shape.text, without walking the paragraphs a second time
+    text = '\n'.join(para.text for para in para_infos)
+    return TextInfo(shape_name, text, para_infos)
 
 def analyze_shape_properties(shape):
     """Extract shape properties."""
@@ -92,184 +165,185 @@ def analyze_picture(shape):
     if shape.shape_type != MSO_SHAPE_TYPE.PICTURE:
         return None
     
-    try:
-        return {
-            'image_size': len(shape.image.blob),
-            'content_type': shape.image.content_type,
-            'accessible': True
-        }
-    except:
+    # Check the blip reference up front instead of letting shape.image raise
+    rId = shape._element.blip_rId
+    if rId is None or rId not in shape.part.rels:
         return {'accessible': False}
-
-print('='*80)
-print('DEEP CONTENT COMPARISON')
-print('='*80)
-
-# Analyze source files
-sources = {}
-for fname in ['test1.pptx', 'test2.pptx']:
-    prs = Presentation(f'/app/assets/slides/templates/{fname}')
-    sources[fname] = []
     
-    print(f'\n📁 SOURCE: {fname}')
-    for slide_idx, slide in enumerate(prs.slides, 1):
-        print(f'\n  Slide {slide_idx}:')
-        slide_data = []
-        
-        for shape_idx, shape in enumerate(slide.shapes):
-            shape_data = {
-                'index': shape_idx,
-                'properties': analyze_shape_properties(shape)
-            }
-            
-            print(f'    Shape {shape_idx}: {shape.name} ({shape.shape_type})')
-            
-            # Position and size
-            print(f'      Position: ({shape.left}, {shape.top}), Size: ({shape.width}, {shape.height})')
-            
-            # Text content
-            text_props = analyze_text_properties(shape, shape.name)
-            if text_props:
-                shape_data['text'] = text_props
-                print(f'      Text: "{shape.text}"')
-                for para_idx, para in enumerate(text_props['paragraphs']):
-                    print(f'        Para {para_idx}: level={para["level"]}, align={para["alignment"]}')
-                    print(f'          Text: "{para["text"]}"')
-                    for run_idx, run in enumerate(para['runs']):
-                        print(f'          Run {run_idx}: "{run["text"]}"')
-                        print(f'            Font: {run["font_name"]}, Size: {run["font_size"]}, Color: {run["color"]}')
-                        print(f'            Bold: {run["bold"]}, Italic: {run["italic"]}')
-            
-            # Picture
-            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                pic_props = analyze_picture(shape)
-                shape_data['picture'] = pic_props
-                if pic_props and pic_props.get('accessible'):
-                    print(f'      Picture: {pic_props["image_size"]} bytes, {pic_props["content_type"]}')
-                else:
-                    print(f'      Picture: ❌ NOT ACCESSIBLE')
-            
-            slide_data.append(shape_data)
-        
-        sources[fname].append(slide_data)
-
-# Analyze merged file
-print('\n' + '='*80)
-print('📄 MERGED OUTPUT: merged-pptx-001.pptx')
-print('='*80)
+    image = shape.image
+    return {
+        'image_size': len(image.blob),
+        'content_type': image.content_type,
+        'accessible': True
+    }
 
-prs = Presentation('/app/assets/output/merge_pptx/merged-pptx-001.pptx')
-merged_data = []
+def analyze_shape(shape_idx, shape):
+    """Collect everything the report needs about one shape."""
+    shape_data = {
+        'index': shape_idx,
+        'properties': analyze_shape_properties(shape)
+    }
+    text_props = analyze_text_properties(shape, shape.name)
+    if text_props:
+        shape_data['text'] = text_props
+    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+        shape_data['picture'] = analyze_picture(shape)
+    return shape_data
 
-for slide_idx, slide in enumerate(prs.slides, 1):
+def print_slide(slide_idx, slide_shapes):
+    """Default walk_prs() printer: dump one slide's analyzed shapes."""
     print(f'\n  Slide {slide_idx}:')
-    slide_data = []
-    
-    for shape_idx, shape in enumerate(slide.shapes):
-        shape_data = {
-            'index': shape_idx,
-            'properties': analyze_shape_properties(shape)
-        }
+    for shape_data in slide_shapes:
+        props = shape_data['properties']
+        print(f'    Shape {shape_data["index"]}: {props["name"]} ({props["type"]})')
         
-        print(f'    Shape {shape_idx}: {shape.name} ({shape.shape_type})')
-        print(f'      Position: ({shape.left}, {shape.top}), Size: ({shape.width}, {shape.height})')
+        # Position and size
+        print(f'      Position: ({props["left"]}, {props["top"]}), Size: ({props["width"]}, {props["height"]})')
         
-        text_props = analyze_text_properties(shape, shape.name)
+        # Text content
+        text_props = shape_data.get('text')
         if text_props:
-            shape_data['text'] = text_props
-            print(f'      Text: "{shape.text}"')
-            for para_idx, para in enumerate(text_props['paragraphs']):
-                print(f'        Para {para_idx}: level={para["level"]}, align={para["alignment"]}')
-                print(f'          Text: "{para["text"]}"')
-                for run_idx, run in enumerate(para['runs']):
-                    print(f'          Run {run_idx}: "{run["text"]}"')
-                    print(f'            Font: {run["font_name"]}, Size: {run["font_size"]}, Color: {run["color"]}')
-                    print(f'            Bold: {run["bold"]}, Italic: {run["italic"]}')
+            print(f'      Text: "{text_props.text}"')
+            for para_idx, para in enumerate(text_props.paragraphs):
+                print(f'        Para {para_idx}: level={para.level}, align={para.alignment}')
+                print(f'          Text: "{para.text}"')
+                for run_idx, run in enumerate(para.runs):
+                    print(f'          Run {run_idx}: "{run.text}"')
+                    print(f'            Font: {run.font_name}, Size: {run.font_size}, Color: {run.color}')
+                    print(f'            Bold: {run.bold}, Italic: {run.italic}')
         
-        if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-            pic_props = analyze_picture(shape)
-            shape_data['picture'] = pic_props
+        # Picture
+        if 'picture' in shape_data:
+            pic_props = shape_data['picture']
             if pic_props and pic_props.get('accessible'):
                 print(f'      Picture: {pic_props["image_size"]} bytes, {pic_props["content_type"]}')
             else:
                 print(f'      Picture: ❌ NOT ACCESSIBLE')
-        
-        slide_data.append(shape_data)
-    
-    merged_data.append(slide_data)
-
-# Compare
-print('\n' + '='*80)
-print('🔍 DIFFERENCES DETECTED')
-print('='*80)
-
-differences = []
-
-# Compare slide 1 (test1)
-print('\n📊 Slide 1 Comparison (from test1.pptx):')
-source_slide = sources['test1.pptx'][0]
-merged_slide = merged_data[0]
-
-for idx in range(max(len(source_slide), len(merged_slide))):
-    if idx >= len(source_slide):
-        print(f'  ❌ Extra shape {idx} in merged (not in source)')
-        differences.append(f'Slide 1: Extra shape {idx}')
-        continue
-    if idx >= len(merged_slide):
-        print(f'  ❌ Missing shape {idx} in merged (was in source)')
-        differences.append(f'Slide 1: Missing shape {idx}')
-        continue
+
+def walk_prs(prs, printer=print_slide):
+    """Yield (slide_idx, shape_idx, shape_data) for every shape in a deck.
     
-    src = source_slide[idx]
-    mrg = merged_slide[idx]
+    `printer(slide_idx, slide_shapes)` is called once per slide; pass a no-op
+    to skip all report formatting.
+    """
+    for slide_idx, slide in enumerate(prs.slides, 1):
+        slide_shapes = [analyze_shape(shape_idx, shape) for shape_idx, shape in enumerate(slide.shapes)]
+        printer(slide_idx, slide_shapes)
+        for shape_data in slide_shapes:
+            yield slide_idx, shape_data['index'], shape_data
+
+def shapes_by_slide(walked):
+    """Group walk_prs() output into {slide_idx: [shape_data, ...]}."""
+    slides = {}
+    for slide_idx, _, shape_data in walked:
+        slides.setdefault(slide_idx, []).append(shape_data)
+    return slides
+
+def main(quiet=False):
+    """Print the deep source/merged comparison; quiet skips the per-shape dump.
     
-    # Compare text
-    if 'text' in src and 'text' in mrg:
-        if src['text']['text'] != mrg['text']['text']:
-            print(f'  ❌ Shape {idx}: Text mismatch')
-            print(f'      Source: "{src["text"]["text"]}"')
-            print(f'      Merged: "{mrg["text"]["text"]}"')
-            differences.append(f'Slide 1 Shape {idx}: Text content differs')
-        
-        # Compare paragraph properties
-        for para_idx in range(max(len(src['text']['paragraphs']), len(mrg['text']['paragraphs']))):
-            if para_idx >= len(src['text']['paragraphs']) or para_idx >= len(mrg['text']['paragraphs']):
+    The report is collected in a StringIO and written to stdout in one go,
+    rather than a lock/flush per print() line.
+    """
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            report(quiet)
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+def report(quiet=False):
+    """Build the comparison report on stdout."""
+    print('='*80)
+    print('DEEP CONTENT COMPARISON')
+    print('='*80)
+
+    printer = (lambda slide_idx, slide_shapes: None) if quiet else print_slide
+
+    # Parse all three decks up front, concurrently
+    src1, src2, merged_prs = load_prs_parallel(
+        '/app/assets/slides/templates/test1.pptx',
+        '/app/assets/slides/templates/test2.pptx',
+        '/app/assets/output/merge_pptx/merged-pptx-001.pptx',
+    )
+
+    decks = [
+        ('test1.pptx', src1, 'source'),
+        ('test2.pptx', src2, 'source'),
+        ('merged-pptx-001.pptx', merged_prs, 'merged'),
+    ]
+
+    walked = {}
+    for fname, prs, role in decks:
+        if not quiet:
+            if role == 'source':
+                print(f'\n📁 SOURCE: {fname}')
+            else:
+                print('\n' + '='*80)
+                print(f'📄 MERGED OUTPUT: {fname}')
+                print('='*80)
+        walked[fname] = shapes_by_slide(walk_prs(prs, printer))
+
+    # Compare
+    print('\n' + '='*80)
+    print('🔍 DIFFERENCES DETECTED')
+    print('='*80)
+
+    differences = []
+
+    # Compare test1 slides against the leading merged slides
+    merged_slides = walked['merged-pptx-001.pptx']
+    for slide_idx, source_slide in walked['test1.pptx'].items():
+        if slide_idx not in merged_slides:
+            break
+        merged_slide = merged_slides[slide_idx]
+        print(f'\n📊 Slide {slide_idx} Comparison (from test1.pptx):')
+
+        for idx in range(max(len(source_slide), len(merged_slide))):
+            if idx >= len(source_slide):
+                print(f'  ❌ Extra shape {idx} in merged (not in source)')
+                differences.append(f'Slide {slide_idx}: Extra shape {idx}')
+                continue
+            if idx >= len(merged_slide):
+                print(f'  ❌ Missing shape {idx} in merged (was in source)')
+                differences.append(f'Slide {slide_idx}: Missing shape {idx}')
+                continue
+
+            src = source_slide[idx]
+            mrg = merged_slide[idx]
+            if 'text' not in src or 'text' not in mrg:
                 continue
-            
-            src_para = src['text']['paragraphs'][para_idx]
-            mrg_para = mrg['text']['paragraphs'][para_idx]
-            
-            if src_para['level'] != mrg_para['level']:
-                print(f'  ❌ Shape {idx} Para {para_idx}: Level mismatch (src={src_para["level"]}, merged={mrg_para["level"]})')
-                differences.append(f'Slide 1 Shape {idx} Para {para_idx}: Bullet level differs')
-            
-            if src_para['alignment'] != mrg_para['alignment']:
-                print(f'  ❌ Shape {idx} Para {para_idx}: Alignment mismatch')
-                differences.append(f'Slide 1 Shape {idx} Para {para_idx}: Alignment differs')
-            
-            # Compare runs
-            for run_idx in range(max(len(src_para['runs']), len(mrg_para['runs']))):
-                if run_idx >= len(src_para['runs']) or run_idx >= len(mrg_para['runs']):
-                    continue
-                
-                src_run = src_para['runs'][run_idx]
-                mrg_run = mrg_para['runs'][run_idx]
-                
-                if src_run['color'] != mrg_run['color']:
-                    print(f'  ❌ Shape {idx} Para {para_idx} Run {run_idx}: Color mismatch')
-                    print(f'      Source: {src_run["color"]}')
-                    print(f'      Merged: {mrg_run["color"]}')
-                    differences.append(f'Slide 1 Shape {idx}: Color differs')
-                
-                if src_run['font_size'] != mrg_run['font_size']:
-                    print(f'  ❌ Shape {idx} Para {para_idx} Run {run_idx}: Font size mismatch ({src_run["font_size"]} vs {mrg_run["font_size"]})')
-                    differences.append(f'Slide 1 Shape {idx}: Font size differs')
-
-print('\n' + '='*80)
-if differences:
-    print(f'❌ FOUND {len(differences)} DIFFERENCES')
-    for diff in differences:
-        print(f'  • {diff}')
-else:
-    print('✅ NO DIFFERENCES FOUND - PERFECT MATCH')
-print('='*80)
+
+            # Compare text
+            if src['text'].text != mrg['text'].text:
+                print(f'  ❌ Shape {idx}: Text mismatch')
+                print(f'      Source: "{src["text"].text}"')
+                print(f'      Merged: "{mrg["text"].text}"')
+                differences.append(f'Slide {slide_idx} Shape {idx}: Text content differs')
+
+            # Compare paragraph properties
+            for para_idx, (src_para, mrg_para) in enumerate(zip(src['text'].paragraphs, mrg['text'].paragraphs)):
+                if src_para.level != mrg_para.level:
+                    print(f'  ❌ Shape {idx} Para {para_idx}: Level mismatch (src={src_para.level}, merged={mrg_para.level})')
+                    differences.append(f'Slide {slide_idx} Shape {idx} Para {para_idx}: Bullet level differs')
+
+                if src_para.alignment != mrg_para.alignment:
+                    print(f'  ❌ Shape {idx} Para {para_idx}: Alignment mismatch')
+                    differences.append(f'Slide {slide_idx} Shape {idx} Para {para_idx}: Alignment differs')
+
+    # Compare runs column-wise over flat per-field lists
+    diff_runs(run_columns(src1), run_columns(merged_prs), differences)
+
+    print('\n' + '='*80)
+    if differences:
+        print(f'❌ FOUND {len(differences)} DIFFERENCES')
+        for diff in differences:
+            print(f'  • {diff}')
+    else:
+        print('✅ NO DIFFERENCES FOUND - PERFECT MATCH')
+    print('='*80)
+
+
+if __name__ == '__main__':
+    main(quiet='--quiet' in sys.argv[1:] or '-q' in sys.argv[1:])
@@ -1,60 +1,53 @@
-from pptx import Presentation
-
-src2 = Presentation('/app/assets/slides/templates/test2.pptx')
-merged = Presentation('/app/assets/output/merge_pptx/merged-pptx-001.pptx')
-
-print('FONT AND COLOR COMPARISON')
-print('='*70)
-
-# Get "Priest:" runs
-src_slide = src2.slides[0]
-merged_slide = merged.slides[1]
-
-for src_shape, merged_shape in zip(src_slide.shapes, merged_slide.shapes):
-    if hasattr(src_shape, 'has_text_frame') and src_shape.has_text_frame:
-        for para_idx, (src_para, merged_para) in enumerate(zip(src_shape.text_frame.paragraphs, merged_shape.text_frame.paragraphs)):
-            for run_idx, (src_run, merged_run) in enumerate(zip(src_para.runs, merged_para.runs)):
-                if 'Priest' in src_run.text or 'People' in src_run.text:
-                    print(f'\nPara {para_idx} Run {run_idx}: "{src_run.text}"')
-                    
-                    # Font name
-                    src_font_name = src_run.font.name
-                    merged_font_name = merged_run.font.name
-                    print(f'  Font name: src={src_font_name}, merged={merged_font_name}')
-                    
-                    # Font size
-                    src_size = src_run.font.size.pt if src_run.font.size else None
-                    merged_size = merged_run.font.size.pt if merged_run.font.size else None
-                    print(f'  Font size: src={src_size}, merged={merged_size}')
-                    
-                    # Color
-                    try:
-                        if src_run.font.color.type:
-                            if src_run.font.color.type == 1:
-                                print(f'  Source color: RGB({src_run.font.color.rgb})')
-                            elif src_run.font.color.type == 2:
-                                print(f'  Source color: SCHEME({src_run.font.color.theme_color})')
-                    except:
-                        print(f'  Source color: None')
-                    
-                    try:
-                        if merged_run.font.color.type:
-                            if merged_run.font.color.type == 1:
-                                print(f'  Merged color: RGB({merged_run.font.color.rgb})')
-                            elif merged_run.font.color.type == 2:
-                                print(f'  Merged color: SCHEME({merged_run.font.color.theme_color})')
-                    except:
-                        print(f'  Merged color: None')
-                    
-                    # Match check
-                    fonts_match = src_font_name == merged_font_name
-                    sizes_match = src_size == merged_size
-                    
-                    if fonts_match and sizes_match:
-                        print(f'  ✅ Matches')
-                    else:
-                        print(f'  ❌ Mismatch!')
-
-print('\n' + '='*70)
-print('Please check the opened PowerPoint file to verify visually')
-print('='*70)
+from compare import compare_runs, font_name, font_size
+from _colors import read_color, format_color
+
+CHECKS = [('font_name', font_name), ('font_size', font_size), ('color', read_color)]
+
+def main():
+    """Compare font name, size and color of the Priest:/People: runs."""
+    print('FONT AND COLOR COMPARISON')
+    print('='*70)
+
+    # Get "Priest:" runs, comparing test2 slide 1 with merged slide 2
+    shapes = compare_runs(
+        '/app/assets/slides/templates/test2.pptx',
+        '/app/assets/output/merge_pptx/merged-pptx-001.pptx',
+        [(0, 1)],
+        CHECKS,
+    )
+    for shape in shapes:
+        for run in shape.runs:
+            if 'Priest' in run.text or 'People' in run.text:
+                print(f'\nPara {run.para_idx} Run {run.run_idx}: "{run.text}"')
+
+                # Font name
+                src_font_name, merged_font_name = run.values['font_name']
+                print(f'  Font name: src={src_font_name}, merged={merged_font_name}')
+
+                # Font size
+                src_size, merged_size = run.values['font_size']
+                print(f'  Font size: src={src_size}, merged={merged_size}')
+
+                # Color
+                src_color, merged_color = run.values['color']
+                if src_color:
+                    print(f'  Source color: {format_color(src_color)}')
+                if merged_color:
+                    print(f'  Merged color: {format_color(merged_color)}')
+
+                # Match check
+                fonts_match = src_font_name == merged_font_name
+                sizes_match = src_size == merged_size
+
+                if fonts_match and sizes_match:
+                    print(f'  ✅ Matches')
+                else:
+                    print(f'  ❌ Mismatch!')
+
+    print('\n' + '='*70)
+    print('Please check the opened PowerPoint file to verify visually')
+    print('='*70)
+
+
+if __name__ == '__main__':
+    main()
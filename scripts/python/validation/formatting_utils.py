@@ -2,8 +2,27 @@
 Generic merge solution that preserves ALL formatting by making everything explicit.
 Works for ANY input presentations regardless of themes.
 """
+import weakref
+
+from lxml import etree
 from pptx.util import Pt, RGBColor
 
+NS = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+# (style_name, level) -> compiled XPath for the master's defRPr/@sz at that level
+SZ_XPATHS = {
+    (style, lvl): etree.XPath(
+        f'p:txStyles/p:{style}/a:lvl{lvl + 1}pPr/a:defRPr/@sz',
+        namespaces={'p': NS, 'a': NS_A},
+    )
+    for style in ('titleStyle', 'bodyStyle')
+    for lvl in range(9)
+}
+
+# master_elem -> {(style_name, level): size}. Weak keys, so the cache lives
+# only as long as the deck's master element and never keeps a deck alive
+_size_cache = weakref.WeakKeyDictionary()
+
 
 def make_formatting_explicit(source_run, target_run, source_prs, source_slide, shape, para):
     """
@@ -45,8 +64,6 @@ def get_effective_font_size(slide, shape, para):
     try:
         master = slide.slide_layout.slide_master
         master_elem = master._element
-        ns = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
-        ns_a = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
         
         # Determine which style to use
         style_name = 'bodyStyle'
@@ -57,23 +74,22 @@ def get_effective_font_size(slide, shape, para):
             except:
                 pass
         
-        txStyles = master_elem.find(f'{ns}txStyles')
-        if txStyles:
-            style = txStyles.find(f'{ns}{style_name}')
-            if style:
-                lvl = para.level + 1
-                lvlpPr = style.find(f'{ns_a}lvl{lvl}pPr')
-                if lvlpPr:
-                    defRPr = lvlpPr.find(f'{ns_a}defRPr')
-                    if defRPr:
-                        sz = defRPr.get('sz')
-                        if sz:
-                            return int(sz) / 100
+        sizes = _size_cache.setdefault(master_elem, {})
+        key = (style_name, para.level)
+        if key not in sizes:
+            sizes[key] = _master_font_size(master_elem, style_name, para.level)
+        return sizes[key]
     except:
         pass
     return None
 
 
+def _master_font_size(master_elem, style_name, level):
+    """Font size in points from the master's txStyles for a paragraph level, or None."""
+    vals = SZ_XPATHS[(style_name, level)](master_elem)
+    return int(vals[0]) / 100 if vals else None
+
+
 def get_effective_font_name(slide, shape):
     """Get the actual font name, resolving theme fonts."""
     # For now, use a common default - in production this would resolve the theme
@@ -1,25 +1,45 @@
-from pptx import Presentation
-
-src2 = Presentation('/app/assets/slides/templates/test2.pptx')
-merged = Presentation('/app/assets/output/merge_pptx/merged-pptx-001.pptx')
-
-print('DETAILED XML COMPARISON - "Priest:" text')
-print('='*70)
-
-# Get the first "Priest:" run from test2
-src_slide = src2.slides[0]
-merged_slide = merged.slides[1]
-
-for src_shape, merged_shape in zip(src_slide.shapes, merged_slide.shapes):
-    if hasattr(src_shape, 'has_text_frame') and src_shape.has_text_frame:
-        for src_para, merged_para in zip(src_shape.text_frame.paragraphs, merged_shape.text_frame.paragraphs):
-            for src_run, merged_run in zip(src_para.runs, merged_para.runs):
-                if 'Priest:' in src_run.text:
-                    print(f'\nText: "{src_run.text}"')
-                    print('\nSOURCE XML:')
-                    from lxml import etree
-                    print(etree.tostring(src_run.element, pretty_print=True, encoding='unicode')[:1000])
-                    
-                    print('\nMERGED XML:')
-                    print(etree.tostring(merged_run.element, pretty_print=True, encoding='unicode')[:1000])
-                    break
+from io import BytesIO
+
+from lxml import etree
+
+from _lazy_prs import read_slide_bytes
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+R_TAG = f'{{{NS_A}}}r'
+T_TAG = f'{{{NS_A}}}t'
+
+def first_priest_run(pptx_path, slide_idx):
+    """First <a:r> on the slide whose text contains "Priest:", or None.
+    
+    The slide XML is streamed with iterparse and the scan stops at the first
+    match; runs already checked are cleared so memory stays flat.
+    """
+    data = read_slide_bytes(pptx_path, slide_idx)
+    for _, r in etree.iterparse(BytesIO(data), events=('end',), tag=R_TAG):
+        if 'Priest:' in r.findtext(T_TAG, ''):
+            return r
+        r.clear()
+    return None
+
+def main():
+    """Print the source and merged XML of the first "Priest:" run."""
+    print('DETAILED XML COMPARISON - "Priest:" text')
+    print('='*70)
+
+    # Get the first "Priest:" run from test2 slide 1 and merged slide 2
+    src_r = first_priest_run('/app/assets/slides/templates/test2.pptx', 0)
+    merged_r = first_priest_run('/app/assets/output/merge_pptx/merged-pptx-001.pptx', 1)
+
+    if src_r is not None and merged_r is not None:
+        print(f'\nText: "{src_r.findtext(T_TAG)}"')
+        print('\nSOURCE XML:')
+        print(etree.tostring(src_r, pretty_print=True, encoding='unicode')[:1000])
+
+        print('\nMERGED XML:')
+        print(etree.tostring(merged_r, pretty_print=True, encoding='unicode')[:1000])
+    else:
+        print('\n"Priest:" run not found in both files')
+
+
+if __name__ == '__main__':
+    main()
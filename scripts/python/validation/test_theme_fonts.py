@@ -1,31 +1,50 @@
-from pptx import Presentation
+import weakref
+
+from _prs_cache import load_prs
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+THEME_ELEMENTS_PATH = f'.//{{{NS_A}}}themeElements'
+FONT_SCHEME_TAG = f'{{{NS_A}}}fontScheme'
+MAJOR_FONT_TAG = f'{{{NS_A}}}majorFont'
+MINOR_FONT_TAG = f'{{{NS_A}}}minorFont'
+LATIN_TAG = f'{{{NS_A}}}latin'
+
+# master_elem -> {is_major: typeface}; weak keys tie each entry to its deck
+_font_cache = weakref.WeakKeyDictionary()
 
 def get_theme_font_name(source_slide, is_major=False):
     """Get the theme font name (major for headings, minor for body) from source slide's master."""
     try:
         master = source_slide.slide_layout.slide_master
         master_elem = master._element
-        ns_a = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
         
-        # Find themeElements
-        themeElements = master_elem.find(f'.//{ns_a}themeElements')
-        if themeElements is not None:
-            fontScheme = themeElements.find(f'{ns_a}fontScheme')
-            if fontScheme is not None:
-                if is_major:
-                    font = fontScheme.find(f'{ns_a}majorFont')
-                else:
-                    font = fontScheme.find(f'{ns_a}minorFont')
-                
-                if font is not None:
-                    latin = font.find(f'{ns_a}latin')
-                    if latin is not None:
-                        return latin.get('typeface')
+        fonts = _font_cache.setdefault(master_elem, {})
+        if is_major not in fonts:
+            fonts[is_major] = _theme_font_name(master_elem, is_major)
+        return fonts[is_major]
     except:
         pass
     return None
 
-prs2 = Presentation('/app/assets/slides/templates/test2.pptx')
+def _theme_font_name(master_elem, is_major):
+    """Latin typeface of the master's major or minor theme font, or None."""
+    # Find themeElements
+    themeElements = master_elem.find(THEME_ELEMENTS_PATH)
+    if themeElements is not None:
+        fontScheme = themeElements.find(FONT_SCHEME_TAG)
+        if fontScheme is not None:
+            if is_major:
+                font = fontScheme.find(MAJOR_FONT_TAG)
+            else:
+                font = fontScheme.find(MINOR_FONT_TAG)
+
+            if font is not None:
+                latin = font.find(LATIN_TAG)
+                if latin is not None:
+                    return latin.get('typeface')
+    return None
+
+prs2 = load_prs('/app/assets/slides/templates/test2.pptx')
 slide = prs2.slides[0]
 
 major_font = get_theme_font_name(slide, is_major=True)
@@ -35,7 +54,7 @@ print(f'test2.pptx theme fonts:')
 print(f'  Major (headings): {major_font}')
 print(f'  Minor (body): {minor_font}')
 
-prs1 = Presentation('/app/assets/slides/templates/test1.pptx')
+prs1 = load_prs('/app/assets/slides/templates/test1.pptx')
 slide = prs1.slides[0]
 
 major_font = get_theme_font_name(slide, is_major=True)
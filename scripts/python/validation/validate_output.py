@@ -3,19 +3,48 @@
 Validate merged PPTX and PDF outputs for corruption and consistency.
 Runs inside Docker container to ensure consistent environment.
 """
+import functools
+import hashlib
+import mmap
 import os
 import sys
 import zipfile
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+
+# _pptx_fastparse lives one level up, next to merge_pptx.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import _pptx_fastparse  # swaps in the leaner XML parser before any deck is loaded
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.exc import PackageNotFoundError
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 OUTPUT_DIR = os.path.join(ROOT, "assets", "output")
 
+# Shape type -> structure counter it increments
+_TYPE_KEY = {
+    MSO_SHAPE_TYPE.TEXT_BOX: "text_boxes",
+    MSO_SHAPE_TYPE.PICTURE: "pictures",
+    MSO_SHAPE_TYPE.TABLE: "tables",
+    MSO_SHAPE_TYPE.CHART: "charts",
+    MSO_SHAPE_TYPE.PLACEHOLDER: "placeholders",
+    MSO_SHAPE_TYPE.GROUP: "groups",
+}
+
 
-def analyze_slide_structure(slide):
-    """Analyze the structure of a single slide."""
+def analyze_slide_structure(slide, picture_digests=None):
+    """Analyze the structure of a single slide.
+    
+    Args:
+        slide: Slide to analyze
+        picture_digests: Optional dict shared across one presentation's slides,
+            mapping image part names to their SHA-256 so a media part used
+            by several pictures is only hashed once
+    """
+    if picture_digests is None:
+        picture_digests = {}
     structure = {
         "shapes": len(slide.shapes),
         "shape_types": {},
@@ -27,54 +56,62 @@ def analyze_slide_structure(slide):
         "charts": 0,
         "placeholders": 0,
         "groups": 0,
-        "picture_sizes": [],  # Track image blob sizes
+        "picture_hashes": Counter(),  # SHA-256 digest of each image blob -> copies
         "fonts": set(),       # Track fonts used
         "has_broken_images": False
     }
     
+    # Accumulate in locals and write back once; the loop runs per shape
+    shape_types = defaultdict(int)
+    counts = dict.fromkeys(_TYPE_KEY.values(), 0)
+    fonts = structure["fonts"]
+    picture_hashes = structure["picture_hashes"]
+    has_text = has_title = has_broken_images = False
+    type_key = _TYPE_KEY.get
+    PICTURE = MSO_SHAPE_TYPE.PICTURE
+    
     for shape in slide.shapes:
         # Count shape types
-        shape_type = str(shape.shape_type)
-        structure["shape_types"][shape_type] = structure["shape_types"].get(shape_type, 0) + 1
+        shape_type = shape.shape_type
+        shape_types[str(shape_type)] += 1
         
         # Check for title
         if shape.has_text_frame:
-            structure["has_text"] = True
+            has_text = True
             if hasattr(shape, "name") and "title" in shape.name.lower():
-                structure["has_title"] = True
+                has_title = True
             
             # Collect fonts
             try:
                 for paragraph in shape.text_frame.paragraphs:
                     for run in paragraph.runs:
-                        if run.font.name:
-                            structure["fonts"].add(run.font.name)
+                        name = run.font.name
+                        if name:
+                            fonts.add(name)
             except:
                 pass
         
         # Count specific shape types
-        if hasattr(shape, "shape_type"):
-            from pptx.enum.shapes import MSO_SHAPE_TYPE
-            if shape.shape_type == MSO_SHAPE_TYPE.TEXT_BOX:
-                structure["text_boxes"] += 1
-            elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                structure["pictures"] += 1
-                # Try to access the image to check if relationship is intact
-                try:
-                    blob = shape.image.blob
-                    structure["picture_sizes"].append(len(blob))
-                except Exception as e:
-                    structure["has_broken_images"] = True
-                    structure["picture_sizes"].append(0)
-            elif shape.shape_type == MSO_SHAPE_TYPE.TABLE:
-                structure["tables"] += 1
-            elif shape.shape_type == MSO_SHAPE_TYPE.CHART:
-                structure["charts"] += 1
-            elif shape.shape_type == MSO_SHAPE_TYPE.PLACEHOLDER:
-                structure["placeholders"] += 1
-            elif shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-                structure["groups"] += 1
+        key = type_key(shape_type)
+        if key:
+            counts[key] += 1
+        
+        if shape_type == PICTURE:
+            # Try to access the image to check if relationship is intact
+            try:
+                image_part = shape.part.related_part(shape._element.blip_rId)
+                digest = picture_digests.get(image_part.partname)
+                if digest is None:
+                    digest = picture_digests[image_part.partname] = hashlib.sha256(shape.image.blob).digest()
+                picture_hashes[digest] += 1
+            except Exception as e:
+                has_broken_images = True
     
+    structure["shape_types"] = dict(shape_types)
+    structure.update(counts)
+    structure["has_text"] = has_text
+    structure["has_title"] = has_title
+    structure["has_broken_images"] = has_broken_images
     return structure
 
 
@@ -112,11 +149,17 @@ def compare_slide_structures(source_structures, merged_structures):
         if src["pictures"] > 0 and merged["pictures"] == 0:
             issues.append(f"Slide {idx}: All images lost ({src['pictures']} pictures missing)")
         elif src["pictures"] > 0 and merged["pictures"] > 0:
-            # Check if image sizes match (indicates images were properly copied)
-            src_sizes = sorted(src.get("picture_sizes", []))
-            merged_sizes = sorted(merged.get("picture_sizes", []))
-            if src_sizes and merged_sizes and src_sizes != merged_sizes:
-                issues.append(f"Slide {idx}: Image data mismatch (sizes: {src_sizes} → {merged_sizes})")
+            # Check the image contents match (indicates images were properly copied)
+            # Counted per digest, so dropped or duplicated copies of one image show up too
+            src_hashes = src.get("picture_hashes", Counter())
+            merged_hashes = merged.get("picture_hashes", Counter())
+            if src_hashes and merged_hashes and src_hashes != merged_hashes:
+                missing = sum((src_hashes - merged_hashes).values())
+                extra = sum((merged_hashes - src_hashes).values())
+                issues.append(
+                    f"Slide {idx}: Image data mismatch ({missing} source image(s) not found in merged, "
+                    f"{extra} extra image(s) in merged)"
+                )
         
         # Check for font loss
         src_fonts = src.get("fonts", set())
@@ -137,12 +180,48 @@ def compare_slide_structures(source_structures, merged_structures):
     return issues
 
 
-def validate_pptx(filepath, source_templates=None):
+@functools.lru_cache(maxsize=64)
+def _template_structures(path, mtime, size):
+    """Slide structures of one template; cached while the file is unchanged.
+    
+    The tuple is shared between callers, so treat it as read-only.
+    """
+    prs = Presentation(path)
+    picture_digests = {}
+    return tuple(analyze_slide_structure(slide, picture_digests) for slide in prs.slides)
+
+
+def analyze_source_templates(source_templates):
+    """Analyze every slide of the source templates once.
+    
+    Returns:
+        (source_structures, warnings) - the per-slide structures of all
+        templates in order, and a warning for each template that failed
+    """
+    source_structures = []
+    warnings = []
+    for template_path in source_templates:
+        try:
+            st = os.stat(template_path)
+        except FileNotFoundError:
+            continue
+        try:
+            source_structures.extend(_template_structures(template_path, st.st_mtime, st.st_size))
+        except Exception as e:
+            warnings.append(f"Could not analyze source {os.path.basename(template_path)}: {e}")
+    return source_structures, warnings
+
+
+def validate_pptx(filepath, source_structures=None, source_warnings=(), deep=False):
     """Validate a PPTX file for corruption and consistency.
     
     Args:
         filepath: Path to PPTX file to validate
-        source_templates: Optional list of source template paths for structure comparison
+        source_structures: Optional pre-analyzed source slide structures
+            (from analyze_source_templates) for structure comparison
+        source_warnings: Warnings from analyzing the source templates
+        deep: Decompress every ZIP entry to verify its CRC (slow on
+            media-heavy decks); otherwise only the central directory is checked
     """
     results = {
         "file": os.path.basename(filepath),
@@ -152,12 +231,13 @@ def validate_pptx(filepath, source_templates=None):
         "info": {}
     }
     
-    # Check 1: File exists and has size
-    if not os.path.exists(filepath):
+    # Check 1: File exists and has size (one stat call for both)
+    try:
+        file_size = os.stat(filepath).st_size
+    except FileNotFoundError:
         results["errors"].append("File does not exist")
         return results
     
-    file_size = os.path.getsize(filepath)
     if file_size == 0:
         results["errors"].append("File is empty (0 bytes)")
         return results
@@ -170,13 +250,23 @@ def validate_pptx(filepath, source_templates=None):
         with zipfile.ZipFile(filepath, 'r') as zf:
             # Check for required OOXML files
             namelist = zf.namelist()
+            names = set(namelist)
             required_files = ['[Content_Types].xml', '_rels/.rels']
-            missing = [f for f in required_files if f not in namelist]
+            missing = [f for f in required_files if f not in names]
             if missing:
                 results["errors"].append(f"Missing required files: {missing}")
             
             # Check for corrupted ZIP entries
-            bad_file = zf.testzip()
+            if deep:
+                bad_file = zf.testzip()
+            else:
+                # Central directory only: a non-empty entry without a CRC, or
+                # one whose data would start past the end of the file
+                bad_file = next(
+                    (info.filename for info in zf.infolist()
+                     if (info.CRC == 0 and info.file_size > 0) or info.header_offset + info.compress_size > file_size),
+                    None,
+                )
             if bad_file:
                 results["errors"].append(f"Corrupted ZIP entry: {bad_file}")
             
@@ -200,23 +290,22 @@ def validate_pptx(filepath, source_templates=None):
         if len(prs.slides) == 0:
             results["warnings"].append("Presentation has no slides")
         
-        # Validate each slide can be accessed
-        for idx, slide in enumerate(prs.slides, 1):
-            try:
-                _ = slide.shapes
-                _ = slide.slide_layout
-            except Exception as e:
-                results["errors"].append(f"Slide {idx} is corrupted: {e}")
-        
         # Check slide dimensions
         results["info"]["width"] = prs.slide_width
         results["info"]["height"] = prs.slide_height
         
-        # Analyze slide structures
+        # Validate each slide can be accessed and analyze its structure in one pass
         slide_structures = []
+        picture_digests = {}
         for idx, slide in enumerate(prs.slides, 1):
             try:
-                structure = analyze_slide_structure(slide)
+                _ = slide.shapes
+                _ = slide.slide_layout
+            except Exception as e:
+                results["errors"].append(f"Slide {idx} is corrupted: {e}")
+            
+            try:
+                structure = analyze_slide_structure(slide, picture_digests)
                 slide_structures.append(structure)
                 results["info"][f"slide_{idx}_shapes"] = structure["shapes"]
                 
@@ -229,17 +318,9 @@ def validate_pptx(filepath, source_templates=None):
             except Exception as e:
                 results["warnings"].append(f"Slide {idx} structure analysis failed: {e}")
         
-        # If source templates provided, compare structures
-        if source_templates:
-            source_structures = []
-            for template_path in source_templates:
-                if os.path.exists(template_path):
-                    try:
-                        src_prs = Presentation(template_path)
-                        for slide in src_prs.slides:
-                            source_structures.append(analyze_slide_structure(slide))
-                    except Exception as e:
-                        results["warnings"].append(f"Could not analyze source {os.path.basename(template_path)}: {e}")
+        # If source structures provided, compare structures
+        if source_structures is not None:
+            results["warnings"].extend(source_warnings)
             
             if source_structures:
                 structure_issues = compare_slide_structures(source_structures, slide_structures)
@@ -269,12 +350,13 @@ def validate_pdf(filepath):
         "info": {}
     }
     
-    # Check 1: File exists and has size
-    if not os.path.exists(filepath):
+    # Check 1: File exists and has size (one stat call for both)
+    try:
+        file_size = os.stat(filepath).st_size
+    except FileNotFoundError:
         results["errors"].append("File does not exist")
         return results
     
-    file_size = os.path.getsize(filepath)
     if file_size == 0:
         results["errors"].append("File is empty (0 bytes)")
         return results
@@ -282,27 +364,29 @@ def validate_pdf(filepath):
     results["info"]["size_bytes"] = file_size
     results["info"]["size_kb"] = round(file_size / 1024, 2)
     
-    # Check 2: PDF header
+    # Check 2 + 3: PDF header and EOF marker, read from one open of the file
     try:
         with open(filepath, 'rb') as f:
-            header = f.read(5)
-            if not header.startswith(b'%PDF-'):
-                results["errors"].append("Invalid PDF header")
-            else:
-                results["info"]["pdf_version"] = header.decode('latin-1')
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    header = m[:5]
+                    has_eof = m.rfind(b'%%EOF', max(0, len(m) - 1024)) != -1  # Last 1KB
+            except (ValueError, OSError):
+                # mmap not supported for this file; read both ends directly
+                header = f.read(5)
+                f.seek(max(0, file_size - 1024))
+                has_eof = b'%%EOF' in f.read()
     except Exception as e:
         results["errors"].append(f"Cannot read file: {e}")
         return results
     
-    # Check 3: PDF EOF marker
-    try:
-        with open(filepath, 'rb') as f:
-            f.seek(-1024, 2)  # Last 1KB
-            tail = f.read()
-            if b'%%EOF' not in tail:
-                results["warnings"].append("No EOF marker found (file may be truncated)")
-    except Exception as e:
-        results["warnings"].append(f"Cannot check EOF: {e}")
+    if not header.startswith(b'%PDF-'):
+        results["errors"].append("Invalid PDF header")
+    else:
+        results["info"]["pdf_version"] = header.decode('latin-1')
+    
+    if not has_eof:
+        results["warnings"].append("No EOF marker found (file may be truncated)")
     
     # Mark as valid if no errors
     results["valid"] = len(results["errors"]) == 0
@@ -312,23 +396,26 @@ def validate_pdf(filepath):
 
 def find_source_templates():
     """Find source template files."""
-    templates = []
     templates_dir = os.path.join(ROOT, "assets", "slides", "templates")
     
-    if os.path.exists(templates_dir):
-        for filename in sorted(os.listdir(templates_dir)):
-            if filename.lower().endswith('.pptx') and not filename.startswith('~$'):
-                templates.append(os.path.join(templates_dir, filename))
+    if not os.path.isdir(templates_dir):
+        return []
     
-    return templates
+    # One directory scan; DirEntry carries the name and type without extra stats
+    with os.scandir(templates_dir) as entries:
+        return sorted(
+            e.path for e in entries
+            if e.is_file() and e.name.lower().endswith('.pptx') and not e.name.startswith('~$')
+        )
 
 
-def validate_directory(directory=None, check_structure=True):
+def validate_directory(directory=None, check_structure=True, deep=False):
     """Validate all output files in a directory.
     
     Args:
         directory: Directory to validate (default: OUTPUT_DIR)
         check_structure: Whether to compare against source templates
+        deep: Verify every PPTX ZIP entry's CRC (see validate_pptx)
     """
     if directory is None:
         directory = OUTPUT_DIR
@@ -337,10 +424,13 @@ def validate_directory(directory=None, check_structure=True):
         print(f"❌ Directory does not exist: {directory}")
         return []
     
-    results = []
-    source_templates = find_source_templates() if check_structure else None
+    # Parse the templates once here rather than once per output file
+    source_structures, source_warnings = None, ()
+    if check_structure:
+        source_structures, source_warnings = analyze_source_templates(find_source_templates())
     
-    # Walk through directory tree
+    # Collect the files first, in walk order, so the report order stays stable
+    jobs = []
     for root, dirs, files in os.walk(directory):
         for filename in sorted(files):
             if filename.startswith('.') or filename.startswith('~$'):
@@ -349,11 +439,19 @@ def validate_directory(directory=None, check_structure=True):
             filepath = os.path.join(root, filename)
             
             if filename.lower().endswith('.pptx'):
-                result = validate_pptx(filepath, source_templates)
-                results.append(result)
+                jobs.append((validate_pptx, (filepath, source_structures, source_warnings, deep)))
             elif filename.lower().endswith('.pdf'):
-                result = validate_pdf(filepath)
-                results.append(result)
+                jobs.append((validate_pdf, (filepath,)))
+    
+    if not jobs:
+        return []
+    
+    # Each file is an independent zip + XML parse, so validate them on separate cores
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = {executor.submit(func, *args): idx for idx, (func, args) in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
     
     return results
 
@@ -404,6 +502,7 @@ def main():
     parser.add_argument("path", nargs="?", help="File or directory to validate (default: assets/output)")
     parser.add_argument("--quiet", "-q", action="store_true", help="Only show errors")
     parser.add_argument("--no-structure", action="store_true", help="Skip structure comparison with templates")
+    parser.add_argument("--deep", action="store_true", help="Decompress every ZIP entry to verify CRCs (slow)")
     args = parser.parse_args()
     
     target = args.path or OUTPUT_DIR
@@ -411,10 +510,11 @@ def main():
     
     if os.path.isfile(target):
         # Validate single file
-        source_templates = find_source_templates() if check_structure else None
-        
         if target.lower().endswith('.pptx'):
-            result = validate_pptx(target, source_templates)
+            source_structures, source_warnings = None, ()
+            if check_structure:
+                source_structures, source_warnings = analyze_source_templates(find_source_templates())
+            result = validate_pptx(target, source_structures, source_warnings, args.deep)
         elif target.lower().endswith('.pdf'):
             result = validate_pdf(target)
         else:
@@ -424,7 +524,7 @@ def main():
         results = [result]
     else:
         # Validate directory
-        results = validate_directory(target, check_structure)
+        results = validate_directory(target, check_structure, args.deep)
     
     return print_results(results)
 
@@ -6,16 +6,15 @@ Usage:
   python wrap_text_report_html.py <text_file> <output_html> <title>
 """
 import argparse
+import html
+import os
 import sys
 from pathlib import Path
 
 
-def wrap_text_report(text_file, output_file, title):
-    """Wrap text report in HTML with navigation."""
-    with open(text_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    html = f"""<!DOCTYPE html>
+# The page is written as HEAD_TMPL, the escaped report text, then TAIL, so the
+# report is streamed through instead of held in memory as one string
+HEAD_TMPL = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -83,13 +82,42 @@ def wrap_text_report(text_file, output_file, title):
     </div>
     
     <div class="content">
-        <pre>{content}</pre>
+        <pre>"""
+
+TAIL = """</pre>
     </div>
 </body>
 </html>"""
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+
+# Report text is copied in chunks of this many characters
+CHUNK_SIZE = 65536
+
+# Escapes for text inside <pre>; one str.translate pass per chunk
+_ESC = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+
+def wrap_text_report(text_file, output_file, title):
+    """Wrap text report in HTML with navigation."""
+    # Stream into a temp file next to the output and move it into place at the
+    # end, so a missing/undecodable input (or output_file == text_file) never
+    # leaves a truncated report behind
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    with open(text_file, 'r', encoding='utf-8') as src:
+        # Created outside the try: if the name is already taken, that file
+        # isn't ours to clean up
+        out = open(tmp_file, 'x', encoding='utf-8')
+        try:
+            with out:
+                out.write(HEAD_TMPL.format(title=html.escape(title, quote=True)))
+                # Escaping never spans characters, so chunks can be escaped independently
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), ''):
+                    out.write(chunk.translate(_ESC))
+                out.write(TAIL)
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
     
     print(f"HTML report saved to: {output_file}")
 